@@ -0,0 +1,192 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+import recursion
+from recursion import solve_hanoi_colors, ENGINES
+
+# Funciones de recursion.py cuyas llamadas se cuentan
+COUNTED_FUNCTIONS = ("solve_recursive", "move_single_disk", "can_place_disk")
+
+# Patrones de color: función (posición desde abajo) -> color
+COLOR_PATTERNS = {
+    # Dos colores por paridad: la secuencia clásica es válida
+    "alternating": lambda index: "red" if index % 2 == 0 else "blue",
+    # Cuatro colores que respetan la paridad: también válida
+    "parity4": lambda index: ("red", "blue", "green", "pink")[index % 4],
+    # Tres colores cíclicos: factible, pero no con la secuencia clásica
+    "cycle3": lambda index: ("red", "blue", "green")[index % 3],
+    # Un solo color: imposible
+    "single": lambda index: "red",
+}
+
+
+def build_disks(n, pattern="alternating"):
+    """
+    Construye una configuración de n discos con el patrón de color indicado.
+
+    Args:
+        n (int): Número de discos
+        pattern (str): Nombre del patrón en COLOR_PATTERNS
+
+    Returns:
+        list: Lista de tuplas (tamaño, color) ordenadas por tamaño descendente
+    """
+    color_of = COLOR_PATTERNS[pattern]
+    return [(n - index, color_of(index)) for index in range(n)]
+
+
+@contextmanager
+def count_calls():
+    """
+    Sustituye temporalmente las funciones de COUNTED_FUNCTIONS en recursion.py
+    por envoltorios que cuentan sus llamadas.
+
+    Yields:
+        dict: Contador de llamadas por nombre de función
+    """
+    counts = {name: 0 for name in COUNTED_FUNCTIONS}
+    originals = {name: getattr(recursion, name) for name in COUNTED_FUNCTIONS}
+    original_engines = dict(ENGINES)
+
+    def counted(name, function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    wrappers = {name: counted(name, function) for name, function in originals.items()}
+    try:
+        for name, wrapper in wrappers.items():
+            setattr(recursion, name, wrapper)
+        # ENGINES guarda referencias directas a las funciones originales
+        for engine, function in original_engines.items():
+            if function.__name__ in wrappers:
+                ENGINES[engine] = wrappers[function.__name__]
+        yield counts
+    finally:
+        for name, function in originals.items():
+            setattr(recursion, name, function)
+        ENGINES.update(original_engines)
+
+
+def measure(engine, pattern, n, repeat):
+    """
+    Mide tiempo, memoria pico y número de llamadas de una resolución.
+
+    Cada métrica se toma en una ejecución separada para que tracemalloc y los
+    contadores no afecten a la medición de tiempo.
+
+    Args:
+        engine (str): Nombre del motor en ENGINES
+        pattern (str): Nombre del patrón en COLOR_PATTERNS
+        n (int): Número de discos
+        repeat (int): Número de repeticiones (se conserva el mejor tiempo)
+
+    Returns:
+        dict: Resultado de la medición
+    """
+    disks = build_disks(n, pattern)
+
+    best = float("inf")
+    moves = -1
+    for _ in range(repeat):
+        start = time.perf_counter()
+        moves = solve_hanoi_colors(n, disks, engine=engine)
+        best = min(best, time.perf_counter() - start)
+    total_moves = len(moves) if moves != -1 else -1
+    # Liberamos la lista antes de medir memoria
+    del moves
+
+    tracemalloc.start()
+    try:
+        solve_hanoi_colors(n, disks, engine=engine)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    with count_calls() as counts:
+        solve_hanoi_colors(n, disks, engine=engine)
+
+    return {
+        "engine": engine,
+        "pattern": pattern,
+        "n": n,
+        "moves": total_moves,
+        "seconds": best,
+        "peak_bytes": peak,
+        "calls": dict(counts),
+    }
+
+
+def run_benchmark(n_min, n_max, engines, patterns, repeat):
+    """
+    Ejecuta las mediciones para cada combinación de motor, patrón y n,
+    mostrando una tabla a medida que se obtienen.
+
+    Args:
+        n_min (int): Número mínimo de discos
+        n_max (int): Número máximo de discos (incluido)
+        engines (list): Nombres de los motores a comparar
+        patterns (list): Nombres de los patrones de color
+        repeat (int): Repeticiones por medición de tiempo
+
+    Returns:
+        list: Resultados de measure
+    """
+    header = (f"{'motor':>10} {'patrón':>12} {'n':>4} {'movimientos':>12} {'tiempo':>10} "
+              f"{'memoria':>10}" + "".join(f" {name:>18}" for name in COUNTED_FUNCTIONS))
+    print(header, file=sys.stderr)
+    print("-" * len(header), file=sys.stderr)
+
+    results = []
+    for engine in engines:
+        for pattern in patterns:
+            for n in range(n_min, n_max + 1):
+                result = measure(engine, pattern, n, repeat)
+                results.append(result)
+                print(f"{engine:>10} {pattern:>12} {n:>4} {result['moves']:>12} "
+                      f"{result['seconds']:>9.3f}s {result['peak_bytes'] / (1024 * 1024):>8.1f}MB"
+                      + "".join(f" {result['calls'][name]:>18}" for name in COUNTED_FUNCTIONS),
+                      file=sys.stderr)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark de tiempo, memoria y llamadas de recursion.py"
+    )
+    # El número de movimientos es 2^n - 1: n=30 supera los mil millones de
+    # movimientos, por lo que el rango por defecto se detiene antes.
+    parser.add_argument("--min", dest="n_min", type=int, default=10, help="Número mínimo de discos")
+    parser.add_argument("--max", dest="n_max", type=int, default=20, help="Número máximo de discos (hasta 30)")
+    parser.add_argument("--engines", nargs="+", default=["iterative", "recursive"], choices=sorted(ENGINES),
+                        help="Motores a comparar")
+    parser.add_argument("--patterns", nargs="+", default=sorted(COLOR_PATTERNS), choices=sorted(COLOR_PATTERNS),
+                        help="Patrones de color")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición de tiempo")
+    parser.add_argument("-o", "--output", help="Archivo JSON de resultados (por defecto stdout)")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run_benchmark(args.n_min, args.n_max, args.engines, args.patterns, args.repeat),
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Resultados guardados en: {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
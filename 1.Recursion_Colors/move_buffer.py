@@ -0,0 +1,251 @@
+import mmap
+from array import array
+
+# Códigos de 2 bits para cada varilla
+ROD_NAMES = ('A', 'B', 'C')
+ROD_CODES = {name: code for code, name in enumerate(ROD_NAMES)}
+
+# Cada movimiento ocupa un entero sin signo de 32 bits:
+# bits 4..31 -> tamaño del disco, bits 2..3 -> origen, bits 0..1 -> destino
+TYPECODE = 'I'
+MAX_DISK_SIZE = (1 << 28) - 1
+
+
+def encode_move(move):
+    """
+    Empaqueta un movimiento en un entero de 32 bits.
+
+    Args:
+        move (tuple): Movimiento (tamaño, origen, destino)
+
+    Returns:
+        int: Movimiento empaquetado
+
+    Raises:
+        ValueError: Si el tamaño del disco no cabe en 28 bits
+    """
+    size, source, target = move
+    if not 0 <= size <= MAX_DISK_SIZE:
+        raise ValueError(f"El tamaño de disco {size} no cabe en 28 bits")
+    return (size << 4) | (ROD_CODES[source] << 2) | ROD_CODES[target]
+
+
+def decode_move(code):
+    """
+    Desempaqueta un movimiento codificado con encode_move.
+
+    Args:
+        code (int): Movimiento empaquetado
+
+    Returns:
+        tuple: Movimiento (tamaño, origen, destino)
+    """
+    return (code >> 4, ROD_NAMES[(code >> 2) & 3], ROD_NAMES[code & 3])
+
+
+class MoveBuffer:
+    """
+    Secuencia compacta de movimientos de Torres de Hanoi.
+
+    Guarda cada movimiento en 4 bytes en lugar de una tupla de Python, admite
+    len, iteración, índices y slicing, y puede escribirse a disco y mapearse
+    en memoria para revisar soluciones grandes sin cargarlas completas.
+    """
+
+    def __init__(self, moves=None):
+        """
+        Inicializa el buffer.
+
+        Args:
+            moves (iterable, optional): Movimientos (tamaño, origen, destino) iniciales
+        """
+        self._data = array(TYPECODE)
+        self._mmap = None
+        if self._data.itemsize != 4:
+            raise RuntimeError("La plataforma no tiene un tipo 'I' de 32 bits")
+        if moves is not None:
+            self.extend(moves)
+
+    @classmethod
+    def _from_data(cls, data, mapped=None):
+        """Crea un buffer sobre datos ya empaquetados (array o memoryview)."""
+        buffer = cls.__new__(cls)
+        buffer._data = data
+        buffer._mmap = mapped
+        return buffer
+
+    @property
+    def readonly(self):
+        """bool: True si el buffer es una vista (mapeo de archivo o slice)."""
+        return not isinstance(self._data, array)
+
+    @property
+    def nbytes(self):
+        """int: Bytes ocupados por los movimientos empaquetados."""
+        return len(self._data) * 4
+
+    def append(self, move):
+        """
+        Añade un movimiento al final del buffer.
+
+        Args:
+            move (tuple): Movimiento (tamaño, origen, destino)
+        """
+        self._check_writable()
+        self._data.append(encode_move(move))
+
+    def extend(self, moves):
+        """
+        Añade varios movimientos al final del buffer.
+
+        Args:
+            moves (iterable): Movimientos (tamaño, origen, destino); también
+                acepta otro MoveBuffer, que se copia sin decodificar
+        """
+        self._check_writable()
+        if isinstance(moves, MoveBuffer):
+            self._data.extend(moves._data)
+        else:
+            self._data.extend(encode_move(move) for move in moves)
+
+    def codes(self):
+        """
+        Devuelve los movimientos empaquetados sin decodificarlos ni copiarlos.
+
+        Returns:
+            array | memoryview: Enteros de 32 bits codificados con encode_move
+        """
+        return self._data
+
+    def _check_writable(self):
+        """Lanza TypeError si el buffer es de solo lectura."""
+        if self.readonly:
+            raise TypeError("El MoveBuffer es de solo lectura")
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        names = ROD_NAMES
+        for code in self._data:
+            yield (code >> 4, names[(code >> 2) & 3], names[code & 3])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Los slices de array se copian; los de memoryview son vistas
+            # que mantienen vivo el mapeo sin ser sus propietarias
+            return MoveBuffer._from_data(self._data[index])
+        return decode_move(self._data[index])
+
+    def __eq__(self, other):
+        if isinstance(other, MoveBuffer):
+            return len(self) == len(other) and self.first_difference(other) is None
+        return NotImplemented
+
+    def __repr__(self):
+        return f"MoveBuffer({len(self)} movimientos)"
+
+    def first_difference(self, other):
+        """
+        Busca el primer movimiento en el que difieren dos soluciones.
+
+        Args:
+            other (MoveBuffer): Buffer con el que comparar
+
+        Returns:
+            int | None: Índice del primer movimiento distinto (o la longitud
+            del más corto si uno es prefijo del otro), None si son iguales
+        """
+        a, b = self._data, other._data
+        shortest = min(len(a), len(b))
+
+        # Comparamos por bloques (en C) y solo recorremos en Python el bloque distinto
+        block = 1 << 16
+        for start in range(0, shortest, block):
+            stop = min(start + block, shortest)
+            if a[start:stop] != b[start:stop]:
+                for i in range(start, stop):
+                    if a[i] != b[i]:
+                        return i
+
+        if len(a) != len(b):
+            return shortest
+        return None
+
+    def save(self, path):
+        """
+        Escribe los movimientos empaquetados en un archivo binario.
+
+        El formato son enteros de 32 bits en el orden de bytes nativo, sin
+        cabecera, por lo que el tamaño del archivo es 4 * len(buffer).
+
+        Args:
+            path (str | Path): Ruta del archivo de salida
+        """
+        with open(path, 'wb') as f:
+            if isinstance(self._data, array):
+                self._data.tofile(f)
+            else:
+                f.write(self._data)
+
+    @classmethod
+    def load(cls, path, mmap_mode=True):
+        """
+        Carga un buffer guardado con save.
+
+        Args:
+            path (str | Path): Ruta del archivo
+            mmap_mode (bool): Si True, mapea el archivo en memoria (solo
+                lectura, sin copiar); si False, lo lee en un buffer editable
+
+        Returns:
+            MoveBuffer: Buffer con los movimientos del archivo
+
+        Raises:
+            ValueError: Si el tamaño del archivo no es múltiplo de 4 bytes
+        """
+        with open(path, 'rb') as f:
+            size = f.seek(0, 2)
+            if size % 4:
+                raise ValueError(f"{path}: {size} bytes no es múltiplo de 4; "
+                                 "no es un archivo de MoveBuffer")
+            f.seek(0)
+
+            if not mmap_mode:
+                data = array(TYPECODE)
+                data.frombytes(f.read())
+                return cls._from_data(data)
+
+            # mmap no admite archivos vacíos
+            if size == 0:
+                return cls._from_data(memoryview(b'').cast(TYPECODE))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls._from_data(memoryview(mapped).cast(TYPECODE), mapped)
+
+    def close(self):
+        """
+        Libera el mapeo de memoria si el buffer se cargó con mmap_mode.
+
+        Los slices obtenidos del buffer deben dejar de usarse antes de cerrarlo.
+
+        Raises:
+            BufferError: Si aún hay slices del buffer; el mapeo no se cierra y
+                el buffer sigue siendo utilizable
+        """
+        if self._mmap is not None:
+            self._data.release()
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Quedan vistas sobre el mapeo: se recupera la vista propia
+                self._data = memoryview(self._mmap).cast(TYPECODE)
+                raise
+            self._mmap = None
+            self._data = array(TYPECODE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,240 @@
+import asyncio
+import copy
+import fnmatch
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from file_processor import FileProcessor, FolderEntry, ANALYZED_SUFFIXES
+from metrics import MetricsSummary
+from results import CsvResult, DicomResult, FolderListing
+
+# Elementos de carpeta leídos por cada llamada al executor en iter_folder
+LISTING_BATCH = 512
+
+
+class AsyncFileProcessor:
+    """
+    Interfaz asyncio de FileProcessor.
+
+    El parseo de CSV y DICOM se ejecuta en un executor de hilos o de procesos
+    para no bloquear el bucle de eventos, con un máximo de operaciones en
+    curso (semáforo): cuando se alcanza, las llamadas esperan su turno y la
+    iteración de carpetas no lanza más trabajo hasta que el consumidor avanza.
+    Los resultados se muestran con el renderizador del procesador desde el
+    hilo del bucle, de modo que la salida de operaciones concurrentes no se
+    mezcla.
+    """
+
+    def __init__(self, processor: FileProcessor, executor: Union[str, Executor] = "thread",
+                 max_workers: Optional[int] = None, max_in_flight: int = 8):
+        """
+        Inicializa la interfaz asíncrona.
+
+        Args:
+            processor (FileProcessor): Procesador a utilizar
+            executor (str | Executor): "thread", "process" o un executor propio
+                (que no se cierra al cerrar esta interfaz). Con hilos no se
+                mide la memoria pico (trace_memory del procesador)
+            max_workers (int, optional): Hilos o procesos del executor creado
+            max_in_flight (int): Máximo de operaciones en curso a la vez
+        """
+        self.processor = processor
+        self.max_in_flight = max_in_flight
+
+        # Copia sin renderizador ni registro de métricas que se ejecuta en el
+        # executor: mostrar y registrar se hace en el bucle
+        self._worker = copy.copy(processor)
+        self._worker.renderer = None
+        self._worker.on_metrics = None
+        self._worker.metrics_summary = MetricsSummary()
+
+        if executor == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._owns_executor = True
+        elif executor == "process":
+            self.executor = ProcessPoolExecutor(max_workers=max_workers)
+            self._owns_executor = True
+        elif isinstance(executor, Executor):
+            self.executor = executor
+            self._owns_executor = False
+        else:
+            raise ValueError(f"Executor desconocido: {executor} (opciones: thread, process o un Executor)")
+
+        # El pico de tracemalloc es global al proceso: en hilos, los análisis
+        # concurrentes se reiniciarían el pico unos a otros
+        if self._worker.trace_memory and isinstance(self.executor, ThreadPoolExecutor):
+            self._worker.trace_memory = False
+            processor.logger.warning("trace_memory se ignora con un executor de hilos: use executor=\"process\"")
+
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def _run(self, function, *args, **kwargs):
+        """Ejecuta una función en el executor respetando el límite de operaciones en curso."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    def _render(self, result):
+        """Registra las métricas de un resultado y lo muestra con el renderizador del procesador."""
+        if getattr(result, 'metrics', None):
+            self.processor._record_metrics(result.file, result.metrics)
+        if self.processor.renderer is not None:
+            self.processor.renderer.render(result)
+        return result
+
+    async def read_csv(self, filename: str, **options) -> CsvResult:
+        """
+        Versión asíncrona de FileProcessor.read_csv.
+
+        Args:
+            filename (str): Nombre del archivo CSV
+            **options: Argumentos de FileProcessor.read_csv (summary, chunksize, cache...)
+
+        Returns:
+            CsvResult: Resultado del análisis
+        """
+        return self._render(await self._run(self._worker.read_csv, filename, **options))
+
+    async def read_dicom(self, filename: str, tags: Optional[List[Tuple[int, int]]] = None,
+                         extract_image: bool = False, image_format: str = "png",
+                         compression: Optional[int] = None) -> DicomResult:
+        """
+        Versión asíncrona de FileProcessor.read_dicom.
+
+        Args:
+            filename (str): Nombre del archivo DICOM
+            tags (List[Tuple[int, int]], optional): Lista de tags DICOM a extraer
+            extract_image (bool): Si True, extrae y guarda la imagen
+            image_format (str): Formato de la imagen (ver FileProcessor.read_dicom)
+            compression (int, optional): Nivel de compresión de 0 a 9
+
+        Returns:
+            DicomResult: Resultado del análisis
+        """
+        return self._render(await self._run(self._worker.read_dicom, filename, tags, extract_image,
+                                            image_format, compression))
+
+    async def list_folder_contents(self, folder_name: str, **options) -> FolderListing:
+        """
+        Versión asíncrona de FileProcessor.list_folder_contents.
+
+        Args:
+            folder_name (str): Nombre de la carpeta a listar
+            **options: Argumentos de FileProcessor.list_folder_contents
+
+        Returns:
+            FolderListing: Contenido de la carpeta
+        """
+        return self._render(await self._run(self._worker.list_folder_contents, folder_name, **options))
+
+    async def iter_folder(self, folder_name: str = ".", **options) -> AsyncIterator[FolderEntry]:
+        """
+        Versión asíncrona de FileProcessor.iter_folder: los elementos se leen
+        en bloques de LISTING_BATCH en un hilo aparte.
+
+        Args:
+            folder_name (str): Carpeta a recorrer, relativa a base_path
+            **options: Argumentos de FileProcessor.iter_folder (details, recursive, max_depth)
+
+        Yields:
+            FolderEntry: Elementos de la carpeta
+        """
+        loop = asyncio.get_running_loop()
+        entries = self._worker.iter_folder(folder_name, **options)
+
+        # El generador vive en este proceso: se avanza siempre en hilos
+        while True:
+            batch = await loop.run_in_executor(None, lambda: list(islice(entries, LISTING_BATCH)))
+            if not batch:
+                return
+            for entry in batch:
+                yield entry
+
+    async def iter_results(self, folder_name: str = ".", pattern: str = "*", recursive: bool = False,
+                           max_depth: Optional[int] = None, summary: bool = False,
+                           chunksize: Optional[int] = None, cache: Optional[str] = None,
+                           tags: Optional[List[Tuple[int, int]]] = None,
+                           extract_image: bool = False, approximate: bool = False,
+                           pixel_stats: bool = False, image_format: str = "png",
+                           compression: Optional[int] = None) -> AsyncIterator[dict]:
+        """
+        Analiza los archivos CSV y DICOM de una carpeta y devuelve cada
+        resultado en cuanto está listo (no en el orden de la carpeta); los
+        demás archivos se omiten, como en process_folder.
+
+        Nunca hay más de max_in_flight archivos en curso: si el consumidor
+        se detiene, no se lanzan nuevos análisis.
+
+        Args:
+            folder_name (str): Carpeta a recorrer, relativa a base_path
+            pattern (str): Patrón de nombre de archivo (p. ej. "*.dcm")
+            recursive (bool): Si True, recorre también las subcarpetas
+            max_depth (int, optional): Con recursive, profundidad máxima
+            summary, chunksize, cache, approximate: Opciones de análisis de CSV (ver read_csv)
+            tags, extract_image, pixel_stats, image_format, compression: Opciones de
+                análisis DICOM (ver process_folder)
+
+        Yields:
+            dict: Archivo, tipo, resultado del análisis y error (como en process_folder)
+        """
+        options = {
+            'summary': summary,
+            'chunksize': chunksize,
+            'cache': cache,
+            'tags': tags,
+            'extract_image': extract_image,
+            'approximate': approximate,
+            'pixel_stats': pixel_stats,
+            'image_format': image_format,
+            'compression': compression,
+        }
+        base_path = self.processor.base_path
+        pending = set()
+
+        try:
+            async for entry in self.iter_folder(folder_name, details=False, recursive=recursive,
+                                                max_depth=max_depth):
+                name = os.path.basename(entry.path)
+                if entry.type != 'file' or not fnmatch.fnmatch(name, pattern) \
+                        or os.path.splitext(name)[1].lower() not in ANALYZED_SUFFIXES:
+                    continue
+
+                # Backpressure: con el cupo lleno esperamos a que termine alguno
+                while len(pending) >= self.max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield self._logged(task.result())
+
+                task_args = (str(Path(entry.path).relative_to(base_path)), options)
+                pending.add(asyncio.ensure_future(self._run(self._worker._process_file, task_args)))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield self._logged(task.result())
+        finally:
+            # Si el consumidor abandona la iteración, cancelamos lo pendiente
+            for task in pending:
+                task.cancel()
+
+    def _logged(self, result: dict) -> dict:
+        """Registra el error y las métricas de un resultado de iter_results."""
+        self.processor._record_metrics(result['file'], result['metrics'])
+        if result['error']:
+            self.processor.logger.error(f"Error al procesar '{result['file']}': {result['error']}")
+        return result
+
+    async def aclose(self) -> None:
+        """Cierra el executor si lo creó esta interfaz."""
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
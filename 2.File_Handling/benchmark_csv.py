@@ -0,0 +1,122 @@
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from file_processor import FileProcessor
+
+
+def build_dataframe(rows: int, numeric_columns: int, text_columns: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Genera un DataFrame sintético con columnas numéricas y de texto.
+
+    Args:
+        rows (int): Número de filas
+        numeric_columns (int): Número de columnas numéricas (enteras y decimales)
+        text_columns (int): Número de columnas de texto
+        seed (int): Semilla del generador aleatorio
+
+    Returns:
+        pd.DataFrame: Datos generados
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(numeric_columns):
+        if i % 2:
+            data[f"num_{i}"] = rng.normal(100, 15, rows)
+        else:
+            data[f"num_{i}"] = rng.integers(0, 1000, rows)
+    for i in range(text_columns):
+        data[f"text_{i}"] = rng.choice([f"cat_{j}" for j in range(50)], rows)
+    return pd.DataFrame(data)
+
+
+def legacy_analysis(df: pd.DataFrame) -> dict:
+    """
+    Estadísticas calculadas como en la versión anterior de read_csv: mean y
+    std por columna, y nunique más value_counts por columna no numérica.
+
+    Args:
+        df (pd.DataFrame): Datos a analizar
+
+    Returns:
+        dict: Estadísticas por columna
+    """
+    result = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        result[col] = (df[col].mean(), df[col].std())
+    for col in df.select_dtypes(exclude=[np.number]).columns:
+        result[col] = (df[col].nunique(), dict(df[col].value_counts().head(5)))
+    return result
+
+
+def best_time(function, repeat: int) -> float:
+    """
+    Mejor tiempo de varias ejecuciones.
+
+    Args:
+        function (callable): Función sin argumentos a medir
+        repeat (int): Número de ejecuciones
+
+    Returns:
+        float: Mejor tiempo en segundos
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark del cálculo de estadísticas de FileProcessor.read_csv"
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Número de filas (p. ej. 10000000)")
+    parser.add_argument("--numeric", type=int, default=45, help="Columnas numéricas")
+    parser.add_argument("--text", type=int, default=5, help="Columnas de texto")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición")
+    parser.add_argument("--csv", action="store_true",
+                        help="Mide también read_csv completo sobre un archivo temporal (incluye el parseo)")
+    parser.add_argument("--cache", choices=["parquet", "feather"],
+                        help="Con --csv, mide también la conversión a caché columnar y las lecturas posteriores")
+    args = parser.parse_args()
+
+    # Evitamos que el log de FileProcessor ensucie la salida
+    logging.disable(logging.CRITICAL)
+
+    print(f"Generando {args.rows} filas x {args.numeric + args.text} columnas...")
+    df = build_dataframe(args.rows, args.numeric, args.text)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        processor = FileProcessor(base_path=tmp, log_file=str(Path(tmp) / "benchmark.log"), renderer=None)
+
+        legacy = best_time(lambda: legacy_analysis(df), args.repeat)
+        vectorized = best_time(lambda: processor._analyze_dataframe(df, summary=True), args.repeat)
+        print(f"Estadísticas por columna (anterior): {legacy:.3f}s")
+        print(f"Estadísticas vectorizadas (actual):  {vectorized:.3f}s")
+        print(f"Aceleración: {legacy / vectorized:.2f}x")
+
+        if args.csv:
+            csv_path = Path(tmp) / "benchmark.csv"
+            df.to_csv(csv_path, index=False)
+            start = time.perf_counter()
+            processor._analyze_csv(csv_path, summary=True)
+            print(f"Lectura y análisis del CSV: {time.perf_counter() - start:.3f}s")
+
+            if args.cache:
+                start = time.perf_counter()
+                processor._analyze_csv(csv_path, summary=True, cache=args.cache)
+                print(f"Primera lectura con caché {args.cache} (incluye la conversión): "
+                      f"{time.perf_counter() - start:.3f}s")
+                cached = best_time(lambda: processor._analyze_csv(csv_path, summary=True, cache=args.cache),
+                                   args.repeat)
+                numeric_only = best_time(lambda: processor._analyze_csv(csv_path, summary=False, cache=args.cache),
+                                         args.repeat)
+                print(f"Lecturas posteriores desde la caché: {cached:.3f}s "
+                      f"(solo columnas numéricas: {numeric_only:.3f}s)")
@@ -0,0 +1,104 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from file_processor import FileProcessor
+
+
+def build_tree(root: Path, files: int, folders: int) -> None:
+    """
+    Crea una carpeta sintética con archivos vacíos repartidos en subcarpetas.
+
+    Args:
+        root (Path): Carpeta donde crear el árbol
+        files (int): Número total de archivos
+        folders (int): Número de subcarpetas (0 = todos en la raíz)
+    """
+    targets = [root] + [root / f"dir_{i:04d}" for i in range(folders)]
+    for target in targets[1:]:
+        target.mkdir()
+    for i in range(files):
+        (targets[i % len(targets)] / f"file_{i:07d}.dat").touch()
+
+
+def legacy_listing(folder_path: Path) -> int:
+    """
+    Listado con detalles como en la versión anterior de list_folder_contents:
+    iterdir, is_file/is_dir por elemento y dos stat por archivo.
+
+    Args:
+        folder_path (Path): Carpeta a listar
+
+    Returns:
+        int: Número de elementos
+    """
+    items = list(folder_path.iterdir())
+    files = [item for item in items if item.is_file()]
+    folders = [item for item in items if item.is_dir()]
+    for file in files:
+        file.stat().st_size
+        file.stat().st_mtime
+    for folder in folders:
+        folder.stat().st_mtime
+    return len(files) + len(folders)
+
+
+def best_time(function, repeat: int) -> float:
+    """
+    Mejor tiempo de varias ejecuciones.
+
+    Args:
+        function (callable): Función sin argumentos a medir
+        repeat (int): Número de ejecuciones
+
+    Returns:
+        float: Mejor tiempo en segundos
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark del listado de carpetas de FileProcessor"
+    )
+    parser.add_argument("--files", type=int, default=100_000, help="Número de archivos")
+    parser.add_argument("--folders", type=int, default=100, help="Subcarpetas para el listado recursivo")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición")
+    parser.add_argument("--dir", help="Carpeta (p. ej. un montaje NFS) donde crear el árbol; por defecto una temporal")
+    args = parser.parse_args()
+
+    # Evitamos que el log de FileProcessor ensucie la salida
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        flat = Path(tmp) / "flat"
+        tree = Path(tmp) / "tree"
+        flat.mkdir()
+        tree.mkdir()
+        print(f"Creando {args.files} archivos en una carpeta y en {args.folders} subcarpetas...")
+        build_tree(flat, args.files, 0)
+        build_tree(tree, args.files, args.folders)
+
+        processor = FileProcessor(base_path=tmp, log_file=os.devnull, renderer=None)
+
+        legacy = best_time(lambda: legacy_listing(flat), args.repeat)
+        names = best_time(lambda: sum(1 for _ in processor.iter_folder("flat", details=False)), args.repeat)
+        details = best_time(lambda: sum(1 for _ in processor.iter_folder("flat")), args.repeat)
+        print(f"Listado con detalles (anterior, iterdir + stat): {legacy:.3f}s")
+        print(f"iter_folder sin detalles (scandir):             {names:.3f}s")
+        print(f"iter_folder con detalles (scandir + 1 stat):    {details:.3f}s")
+        print(f"Aceleración con detalles: {legacy / details:.2f}x")
+
+        walk = best_time(lambda: sum(len(files) + len(dirs) for _, dirs, files in os.walk(tree)), args.repeat)
+        recursive = best_time(lambda: sum(1 for _ in processor.iter_folder("tree", details=False, recursive=True)),
+                              args.repeat)
+        print(f"Recursivo, os.walk:                  {walk:.3f}s")
+        print(f"Recursivo, iter_folder sin detalles: {recursive:.3f}s")
@@ -0,0 +1,339 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+# pyarrow es opcional: solo se necesita para la caché columnar y los reportes Parquet
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Formatos de caché admitidos y extensión del archivo
+CACHE_FORMATS = {'parquet': '.parquet', 'feather': '.feather'}
+
+# Carpeta de las cachés, junto al CSV original
+CACHE_DIR = '.csv_cache'
+
+# Clave de los metadatos del esquema con la firma del CSV original
+SOURCE_KEY = b'file_processor.source'
+
+
+def require_pyarrow() -> None:
+    """
+    Comprueba que pyarrow está instalado.
+
+    Raises:
+        ImportError: Si pyarrow no está disponible
+    """
+    if pa is None:
+        raise ImportError("La caché columnar y los reportes Parquet requieren pyarrow (pip install pyarrow)")
+
+
+def source_signature(csv_path: Path) -> bytes:
+    """
+    Firma de un CSV: fecha de modificación (ns) y tamaño.
+
+    Args:
+        csv_path (Path): Ruta del archivo CSV
+
+    Returns:
+        bytes: Firma que se guarda en los metadatos de la caché
+    """
+    stat = csv_path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+
+
+def sidecar_path(csv_path: Path, fmt: str) -> Path:
+    """
+    Ruta de la caché columnar de un CSV: '<carpeta>/.csv_cache/<nombre>.<formato>'.
+
+    Args:
+        csv_path (Path): Ruta del archivo CSV
+        fmt (str): Formato de la caché ('parquet' o 'feather')
+
+    Returns:
+        Path: Ruta de la caché
+    """
+    if fmt not in CACHE_FORMATS:
+        raise ValueError(f"Formato de caché desconocido: {fmt} (opciones: {', '.join(CACHE_FORMATS)})")
+    return csv_path.parent / CACHE_DIR / (csv_path.name + CACHE_FORMATS[fmt])
+
+
+def read_schema(path: Path, fmt: str) -> "pa.Schema":
+    """
+    Lee el esquema de una caché sin leer sus datos.
+
+    Args:
+        path (Path): Ruta de la caché
+        fmt (str): Formato de la caché
+
+    Returns:
+        pa.Schema: Esquema con los metadatos de la caché
+    """
+    if fmt == 'parquet':
+        return pq.read_schema(path)
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def cached_schema(csv_path: Path, fmt: str) -> Optional["pa.Schema"]:
+    """
+    Esquema de la caché de un CSV si existe y corresponde a la versión actual
+    del archivo (misma fecha de modificación y tamaño).
+
+    Args:
+        csv_path (Path): Ruta del archivo CSV
+        fmt (str): Formato de la caché
+
+    Returns:
+        pa.Schema | None: Esquema de la caché, o None si no existe o está desactualizada
+    """
+    path = sidecar_path(csv_path, fmt)
+    if not path.exists():
+        return None
+    try:
+        schema = read_schema(path, fmt)
+    except (OSError, pa.ArrowException):
+        # Caché ilegible (p. ej. escritura interrumpida): se regenera
+        return None
+    if (schema.metadata or {}).get(SOURCE_KEY) != source_signature(csv_path):
+        return None
+    return schema
+
+
+def is_text(data_type: "pa.DataType") -> bool:
+    """Indica si un tipo de Arrow es texto (pandas 3 usa large_string)."""
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def widen_schema(schema: "pa.Schema", other: "pa.Schema") -> "pa.Schema":
+    """
+    Esquema que admite los datos de dos esquemas con las mismas columnas.
+
+    Cada columna toma el tipo común más amplio (p. ej. int64 y double dan
+    double, como cuando pandas encuentra valores vacíos en una columna entera);
+    si los tipos no son compatibles, la columna pasa a texto.
+
+    Args:
+        schema (pa.Schema): Esquema actual (se conservan sus metadatos)
+        other (pa.Schema): Esquema de un bloque posterior
+
+    Returns:
+        pa.Schema: Esquema ampliado
+    """
+    fields = []
+    for field in schema:
+        other_field = other.field(field.name)
+        if other_field.type == field.type:
+            fields.append(field)
+            continue
+        try:
+            merged = pa.unify_schemas([pa.schema([field]), pa.schema([other_field])], promote_options='permissive')
+            fields.append(merged.field(0))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            fields.append(pa.field(field.name, pa.large_string()))
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+def convert_csv(csv_path: Path, fmt: str, chunksize: Optional[int] = None) -> "pa.Schema":
+    """
+    Convierte un CSV en su caché columnar.
+
+    El CSV se parsea con pandas (los tipos coinciden con los de read_csv) y el
+    archivo se escribe con un nombre temporal y se renombra al terminar, de
+    modo que otro proceso nunca lee una caché a medio escribir.
+
+    Con chunksize, el esquema se fija con el primer bloque y los bloques
+    siguientes se convierten a él. Si un bloque no cabe en el esquema (p. ej.
+    una columna entera que más adelante tiene valores vacíos y pandas lee como
+    decimal), el esquema se amplía (ver widen_schema) y la conversión vuelve a
+    empezar con él, de modo que los tipos son los de una lectura completa.
+
+    Args:
+        csv_path (Path): Ruta del archivo CSV
+        fmt (str): Formato de la caché
+        chunksize (int, optional): Si se indica, convierte por bloques de este
+            número de filas en lugar de cargar el CSV completo
+
+    Returns:
+        pa.Schema: Esquema de la caché escrita
+    """
+    require_pyarrow()
+    path = sidecar_path(csv_path, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    signature = source_signature(csv_path)
+    schema = None
+    while True:
+        widened = _write_sidecar(csv_path, fmt, tmp_path, chunksize, signature, schema)
+        if widened is None:
+            break
+        schema = widened
+
+    os.replace(tmp_path, path)
+    return read_schema(path, fmt)
+
+
+def _write_sidecar(csv_path: Path, fmt: str, tmp_path: Path, chunksize: Optional[int], signature: bytes,
+                   schema: Optional["pa.Schema"]) -> Optional["pa.Schema"]:
+    """
+    Escribe la caché en tmp_path con el esquema indicado (o el del primer bloque).
+
+    Returns:
+        pa.Schema | None: None si se escribió la caché; el esquema ampliado si
+        un bloque no cabía en el esquema (el archivo temporal se elimina)
+    """
+    # Las columnas que ya se sabe que son texto se leen como texto en todos los bloques
+    dtype = {field.name: str for field in schema if is_text(field.type)} if schema else None
+    if chunksize:
+        chunks = pd.read_csv(csv_path, chunksize=chunksize, dtype=dtype)
+    else:
+        chunks = [pd.read_csv(csv_path, dtype=dtype)]
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = schema or table.schema
+                schema = schema.with_metadata({**(table.schema.metadata or {}), SOURCE_KEY: signature})
+                if fmt == 'parquet':
+                    writer = pq.ParquetWriter(tmp_path, schema)
+                else:
+                    writer = pa.ipc.new_file(str(tmp_path), schema)
+            if not table.schema.equals(schema):
+                widened = widen_schema(schema, table.schema)
+                if not widened.equals(schema):
+                    writer.close()
+                    tmp_path.unlink(missing_ok=True)
+                    return widened
+                table = table.cast(schema)
+            writer.write_table(table.replace_schema_metadata(schema.metadata))
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    writer.close()
+    return None
+
+
+def numeric_columns(schema: "pa.Schema") -> List[str]:
+    """
+    Columnas numéricas de un esquema (las que pandas considera np.number).
+
+    Args:
+        schema (pa.Schema): Esquema de la caché
+
+    Returns:
+        List[str]: Nombres de las columnas enteras o decimales
+    """
+    return [field.name for field in schema
+            if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)]
+
+
+def row_count(path: Path, fmt: str) -> int:
+    """
+    Número de filas de una caché, leído de sus metadatos.
+
+    Args:
+        path (Path): Ruta de la caché
+        fmt (str): Formato de la caché
+
+    Returns:
+        int: Número de filas
+    """
+    if fmt == 'parquet':
+        return pq.ParquetFile(path).metadata.num_rows
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+
+def read_columns(path: Path, fmt: str, columns: List[str]) -> pd.DataFrame:
+    """
+    Lee solo las columnas indicadas de una caché.
+
+    Args:
+        path (Path): Ruta de la caché
+        fmt (str): Formato de la caché
+        columns (List[str]): Columnas a leer
+
+    Returns:
+        pd.DataFrame: Datos de las columnas, con los tipos originales
+    """
+    if fmt == 'parquet':
+        return pq.read_table(path, columns=columns).to_pandas()
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all().select(columns).to_pandas()
+
+
+def iter_columns(path: Path, fmt: str, columns: List[str], chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Lee las columnas indicadas de una caché por bloques.
+
+    Args:
+        path (Path): Ruta de la caché
+        fmt (str): Formato de la caché
+        columns (List[str]): Columnas a leer
+        chunksize (int): Número máximo de filas por bloque
+
+    Yields:
+        pd.DataFrame: Bloques de datos con los tipos originales
+    """
+    if fmt == 'parquet':
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i).select(columns)
+            for start in range(0, batch.num_rows, chunksize):
+                yield batch.slice(start, chunksize).to_pandas()
+
+
+def stats_table(analysis: dict, source: str) -> "pa.Table":
+    """
+    Estadísticas de read_csv como tabla, una fila por columna analizada.
+
+    Args:
+        analysis (dict): Resultado del análisis de read_csv
+        source (str): Nombre del CSV analizado (se guarda en los metadatos)
+
+    Returns:
+        pa.Table: Tabla con columna, tipo y estadísticas (los márgenes de error
+        del modo aproximado son nulos en un análisis exacto)
+    """
+    require_pyarrow()
+    rows = []
+    for col, data in analysis['numeric'].items():
+        rows.append({'column': str(col), 'kind': 'numeric',
+                     'average': float(data['average']), 'std_dev': float(data['std_dev']),
+                     'average_margin': data.get('average_margin'), 'std_dev_margin': data.get('std_dev_margin'),
+                     'sample_size': data.get('sample_size')})
+    for col, data in analysis['non_numeric'].items():
+        rows.append({'column': str(col), 'kind': 'non_numeric',
+                     'unique': int(data['unique']), 'unique_exceeded': bool(data['unique_exceeded']),
+                     'top': json.dumps({str(value): int(count) for value, count in data['top'].items()},
+                                       ensure_ascii=False),
+                     'approximate': bool(data['approximate']), 'error_bound': int(data['error_bound']),
+                     'unique_error': data.get('unique_error')})
+
+    schema = pa.schema([
+        ('column', pa.string()), ('kind', pa.string()),
+        ('average', pa.float64()), ('std_dev', pa.float64()),
+        ('average_margin', pa.float64()), ('std_dev_margin', pa.float64()), ('sample_size', pa.int64()),
+        ('unique', pa.int64()), ('unique_exceeded', pa.bool_()),
+        ('top', pa.string()), ('approximate', pa.bool_()), ('error_bound', pa.int64()),
+        ('unique_error', pa.float64()),
+    ], metadata={b'source': source.encode(), b'rows': str(analysis['rows']).encode()})
+    return pa.Table.from_pylist(rows, schema=schema)
@@ -0,0 +1,532 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Filas por pasada en RunningMoments.update
+ROWS_PER_PASS = 8192
+
+
+def value_frequencies(values: pd.Series, k: int = 5) -> tuple:
+    """
+    Valores únicos y más frecuentes de una columna en una sola pasada.
+
+    Factoriza la columna (una pasada con tabla hash) y cuenta los códigos con
+    np.bincount, en lugar de llamar por separado a nunique y value_counts.
+
+    Args:
+        values (pd.Series): Valores de la columna
+        k (int): Número de valores más frecuentes a devolver
+
+    Returns:
+        tuple: (número de valores únicos sin contar NaN, dict valor -> conteo
+        de los k más frecuentes, de mayor a menor)
+    """
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    # Orden estable: a igual conteo, primero el valor que aparece antes
+    order = np.argsort(-counts, kind='stable')[:k]
+    return len(uniques), {uniques[i]: counts[i] for i in order}
+
+
+class RunningMoments:
+    """
+    Media y desviación estándar por columna acumuladas bloque a bloque.
+
+    Cada bloque se resume en (conteo, media, M2) con dos pasadas vectorizadas
+    y se combina con el acumulado mediante la fórmula paralela de Chan et al.
+    (generalización de Welford), que es numéricamente estable y no necesita
+    conservar los datos.
+    """
+
+    def __init__(self, columns):
+        """
+        Inicializa los acumuladores.
+
+        Args:
+            columns (list): Nombres de las columnas numéricas
+        """
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+
+    def update(self, block: np.ndarray) -> None:
+        """
+        Añade un bloque de filas. Los NaN se ignoran, como en pandas.
+
+        El bloque se recorre en tramos de ROWS_PER_PASS filas para que los
+        temporales de cada pasada quepan en caché.
+
+        Args:
+            block (np.ndarray): Array 2-D (filas x columnas) de tipo float
+        """
+        for start in range(0, len(block), ROWS_PER_PASS):
+            self._update_rows(block[start:start + ROWS_PER_PASS])
+
+    def _update_rows(self, block: np.ndarray) -> None:
+        """Resume un tramo de filas y lo combina con el acumulado."""
+        mean = block.mean(axis=0)
+
+        if np.isnan(mean).any():
+            # Hay NaN en el tramo: contamos y sumamos solo los valores válidos
+            count = (~np.isnan(block)).sum(axis=0).astype(float)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = np.nansum(block, axis=0) / count
+                m2 = np.nansum((block - mean) ** 2, axis=0)
+        else:
+            count = np.full(block.shape[1], float(len(block)))
+            deviations = block - mean
+            m2 = np.einsum('ij,ij->j', deviations, deviations)
+
+        self.merge(count, mean, m2)
+
+    def merge(self, count: np.ndarray, mean: np.ndarray, m2: np.ndarray) -> None:
+        """
+        Combina un resumen (conteo, media, M2) con el acumulado.
+
+        Args:
+            count (np.ndarray): Número de valores por columna
+            mean (np.ndarray): Media por columna
+            m2 (np.ndarray): Suma de cuadrados de las desviaciones por columna
+        """
+        total = self.count + count
+        has_values = count > 0
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean - self.mean
+            ratio = count / total
+            new_mean = self.mean + delta * ratio
+            new_m2 = self.m2 + m2 + delta ** 2 * self.count * ratio
+
+        self.mean = np.where(has_values, new_mean, self.mean)
+        self.m2 = np.where(has_values, new_m2, self.m2)
+        self.count = total
+
+    def merge_from(self, other: "RunningMoments") -> None:
+        """
+        Combina otro acumulador con las mismas columnas.
+
+        Args:
+            other (RunningMoments): Acumulador a combinar
+        """
+        self.merge(other.count, other.mean, other.m2)
+
+    def means(self) -> np.ndarray:
+        """np.ndarray: Media por columna (NaN si no hay valores)."""
+        return np.where(self.count > 0, self.mean, np.nan)
+
+    def stds(self, ddof: int = 1) -> np.ndarray:
+        """
+        Desviación estándar por columna.
+
+        Args:
+            ddof (int): Grados de libertad restados (1 = muestral, como pandas)
+
+        Returns:
+            np.ndarray: Desviación estándar (NaN si no hay suficientes valores)
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > ddof, np.sqrt(self.m2 / (self.count - ddof)), np.nan)
+
+
+class FrequencySummary:
+    """
+    Frecuencias aproximadas de una columna no numérica con memoria acotada.
+
+    Conserva como mucho `capacity` valores con sus conteos. Al combinar un
+    bloque se suman los conteos y se descartan los menos frecuentes; la suma,
+    sobre todos los truncados, del mayor conteo descartado en cada uno es una
+    cota del error de cualquier conteo. Los valores distintos se cuentan exactamente hasta
+    `distinct_limit`; por encima solo se informa de que se superó el límite.
+    """
+
+    def __init__(self, capacity: int = 1000, distinct_limit: int = 100_000):
+        """
+        Inicializa el resumen.
+
+        Args:
+            capacity (int): Número máximo de valores con conteo
+            distinct_limit (int): Máximo de valores distintos contados exactamente
+        """
+        self.capacity = capacity
+        self.distinct_limit = distinct_limit
+        self.counts = pd.Series(dtype='int64')
+        self.error_bound = 0
+        self._distinct = set()
+        self.distinct_exceeded = False
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Añade los valores de un bloque.
+
+        Args:
+            values (pd.Series): Valores de la columna en el bloque
+        """
+        block_counts = values.value_counts()
+
+        if not self.distinct_exceeded:
+            self._distinct.update(block_counts.index)
+            if len(self._distinct) > self.distinct_limit:
+                self.distinct_exceeded = True
+                self._distinct = set()
+
+        merged = self.counts.add(block_counts, fill_value=0).astype('int64')
+        if len(merged) > self.capacity:
+            merged = merged.sort_values(ascending=False)
+            self.error_bound += int(merged.iloc[self.capacity])
+            merged = merged.iloc[:self.capacity]
+        self.counts = merged
+
+    @property
+    def distinct(self) -> int:
+        """int: Valores distintos vistos (o distinct_limit si se superó)."""
+        return self.distinct_limit if self.distinct_exceeded else len(self._distinct)
+
+    @property
+    def exact(self) -> bool:
+        """bool: True si los conteos no han sufrido truncados."""
+        return self.error_bound == 0
+
+    def top(self, k: int = 5) -> dict:
+        """
+        Valores más frecuentes.
+
+        Args:
+            k (int): Número de valores a devolver
+
+        Returns:
+            dict: Valor -> conteo estimado, de mayor a menor
+        """
+        return dict(self.counts.sort_values(ascending=False, kind='stable').head(k))
+
+
+# Filas del muestreo de reservorio del modo aproximado
+RESERVOIR_SIZE = 100_000
+
+# Cuantil de la normal para los intervalos de confianza del 95 %
+Z_95 = 1.959964
+
+
+class ReservoirSample:
+    """
+    Muestra aleatoria uniforme de tamaño fijo de las filas de un archivo
+    (muestreo de reservorio, algoritmo R), vectorizada por bloque.
+
+    De la muestra salen la media y la desviación estándar de cada columna con
+    su margen de error al 95 % (aproximación normal, con corrección por
+    población finita), sin que la memoria dependa del tamaño del archivo.
+    """
+
+    def __init__(self, columns, size: int = RESERVOIR_SIZE, seed: Optional[int] = None):
+        """
+        Inicializa el reservorio.
+
+        Args:
+            columns (list): Nombres de las columnas numéricas
+            size (int): Número de filas de la muestra
+            seed (int, optional): Semilla del generador aleatorio
+        """
+        self.columns = list(columns)
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.sample = np.empty((size, len(self.columns)))
+        self.seen = 0
+        # Valores no nulos por columna en todo el archivo (para la corrección finita)
+        self.count = np.zeros(len(self.columns))
+
+    def update(self, block: np.ndarray) -> None:
+        """
+        Añade un bloque de filas.
+
+        Args:
+            block (np.ndarray): Array 2-D (filas x columnas) de tipo float
+        """
+        self.count += (~np.isnan(block)).sum(axis=0)
+
+        # Mientras el reservorio no está lleno, las filas entran directamente
+        free = max(min(self.size - self.seen, len(block)), 0)
+        if free:
+            self.sample[self.seen:self.seen + free] = block[:free]
+
+        # Cada fila posterior (posición global t) sustituye a una posición
+        # aleatoria j en [0, t] si j < size
+        rest = block[free:]
+        if len(rest):
+            positions = np.arange(self.seen + free, self.seen + len(block)) + 1
+            targets = (self.rng.random(len(rest)) * positions).astype(np.int64)
+            chosen = targets < self.size
+            self.sample[targets[chosen]] = rest[chosen]
+
+        self.seen += len(block)
+
+    def estimates(self) -> List[dict]:
+        """
+        Media y desviación estándar estimadas por columna.
+
+        Returns:
+            list: Por columna, dict con 'average', 'std_dev', sus márgenes al
+            95 % ('average_margin', 'std_dev_margin') y 'sample_size'
+        """
+        sample = self.sample[:min(self.seen, self.size)]
+        results = []
+        for index in range(len(self.columns)):
+            values = sample[:, index]
+            values = values[~np.isnan(values)]
+            n = len(values)
+            total = self.count[index]
+            if n < 2:
+                mean = values.mean() if n else np.nan
+                results.append({'average': mean, 'std_dev': np.nan, 'average_margin': np.nan,
+                                'std_dev_margin': np.nan, 'sample_size': n})
+                continue
+
+            mean = values.mean()
+            std = values.std(ddof=1)
+            # Corrección por población finita: si la muestra es todo el archivo, el margen es 0
+            fpc = np.sqrt(max(total - n, 0) / (total - 1)) if total > 1 else 0.0
+            results.append({
+                'average': mean,
+                'std_dev': std,
+                'average_margin': Z_95 * std / np.sqrt(n) * fpc,
+                'std_dev_margin': Z_95 * std / np.sqrt(2 * (n - 1)) * fpc,
+                'sample_size': n,
+            })
+        return results
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """
+    Hash de 64 bits de cada valor no nulo de una columna (vectorizado). Los
+    valores se hashean como objetos, de modo que un mismo valor da el mismo
+    hash aunque el tipo de la columna cambie entre bloques.
+
+    Args:
+        values (pd.Series): Valores de la columna
+
+    Returns:
+        np.ndarray: Hashes uint64
+    """
+    return pd.util.hash_pandas_object(values.dropna().astype(object), index=False).to_numpy()
+
+
+class HyperLogLog:
+    """
+    Estimación del número de valores distintos con memoria fija
+    (HyperLogLog con corrección de rango bajo). Con precision=14 usa 16384
+    registros y el error relativo típico es 1.04 / sqrt(16384) ≈ 0.8 %.
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Inicializa los registros.
+
+        Args:
+            precision (int): Bits del hash que eligen el registro (4 a 18)
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> None:
+        """
+        Añade valores a partir de sus hashes de 64 bits.
+
+        Args:
+            hashes (np.ndarray): Hashes uint64 (ver hash_values)
+        """
+        if not len(hashes):
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+
+        # Posición del primer bit a 1 en los 64 - p bits restantes; el número
+        # de bits se obtiene exacto con frexp sobre mitades de 32 bits
+        high = (rest >> np.uint64(32)).astype(np.float64)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bits = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+        rank = (64 - p + 1 - bits).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Combina otro estimador con la misma precisión.
+
+        Args:
+            other (HyperLogLog): Estimador a combinar
+        """
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def relative_error(self) -> float:
+        """float: Error relativo al 95 % (dos errores típicos)."""
+        return 2 * 1.04 / len(self.registers) ** 0.5
+
+    def estimate(self) -> int:
+        """
+        Número estimado de valores distintos.
+
+        Returns:
+            int: Estimación
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if raw <= 2.5 * m and zeros:
+            # Rango bajo: conteo lineal de registros vacíos
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+class CountMinTopK:
+    """
+    Valores más frecuentes de una columna con un sketch Count-Min.
+
+    El sketch (depth filas x 2^width_bits contadores) sobreestima cada conteo
+    como mucho en e / 2^width_bits * N con probabilidad 1 - e^-depth. Los candidatos a
+    más frecuentes son los más frecuentes de cada bloque más los anteriores;
+    se conservan los `capacity` con mayor conteo estimado.
+    """
+
+    def __init__(self, width_bits: int = 16, depth: int = 4, capacity: int = 100, seed: int = 0):
+        """
+        Inicializa el sketch.
+
+        Args:
+            width_bits (int): Log2 del número de contadores por fila
+            depth (int): Número de filas (funciones hash)
+            capacity (int): Número de candidatos a más frecuentes conservados
+            seed (int): Semilla de las funciones hash
+        """
+        rng = np.random.default_rng(seed)
+        self.width_bits = width_bits
+        self.width = 1 << width_bits
+        self.depth = depth
+        self.capacity = capacity
+        self.table = np.zeros((depth, self.width), dtype=np.int64)
+        # Multiplicadores impares para hashing multiplicativo de cada fila
+        self.multipliers = rng.integers(1, 1 << 63, size=depth, dtype=np.uint64) | np.uint64(1)
+        self.total = 0
+        self.candidates = {}
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        """Contador de cada hash en cada fila (depth x n): bits altos del producto."""
+        mixed = hashes[np.newaxis, :] * self.multipliers[:, np.newaxis]
+        return (mixed >> np.uint64(64 - self.width_bits)).astype(np.intp)
+
+    def update(self, values: pd.Series, hashes: Optional[np.ndarray] = None) -> None:
+        """
+        Añade los valores de un bloque.
+
+        Args:
+            values (pd.Series): Valores de la columna en el bloque
+            hashes (np.ndarray, optional): hash_values(values), si ya se calcularon
+        """
+        values = values.dropna()
+        if not len(values):
+            return
+        if hashes is None:
+            hashes = hash_values(values)
+        # Un solo bincount para todas las filas, desplazando cada una width contadores
+        columns = self._columns(hashes) + (np.arange(self.depth) * self.width)[:, np.newaxis]
+        self.table += np.bincount(columns.ravel(), minlength=self.depth * self.width).reshape(self.depth, self.width)
+        self.total += len(values)
+
+        # Candidatos: los más frecuentes del bloque y los que ya había
+        block_top = values.value_counts().head(self.capacity)
+        candidates = list(self.candidates) + [value for value in block_top.index if value not in self.candidates]
+        estimates = self.query(pd.Series(candidates, dtype=object))
+        ranked = sorted(zip(candidates, estimates), key=lambda item: -item[1])[:self.capacity]
+        self.candidates = dict(ranked)
+
+    def query(self, values: pd.Series) -> np.ndarray:
+        """
+        Conteo estimado (nunca menor que el real) de cada valor.
+
+        Args:
+            values (pd.Series): Valores a consultar
+
+        Returns:
+            np.ndarray: Conteos estimados
+        """
+        if not len(values):
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(hash_values(values))
+        return self.table[np.arange(self.depth)[:, np.newaxis], columns].min(axis=0)
+
+    @property
+    def error_bound(self) -> int:
+        """int: Sobreestimación máxima de cualquier conteo (con probabilidad 1 - e^-depth)."""
+        return int(np.ceil(np.e / self.width * self.total))
+
+    def top(self, k: int = 5) -> dict:
+        """
+        Valores más frecuentes.
+
+        Args:
+            k (int): Número de valores a devolver
+
+        Returns:
+            dict: Valor -> conteo estimado, de mayor a menor
+        """
+        return {value: int(count) for value, count in list(self.candidates.items())[:k]}
+
+
+class SketchSummary:
+    """
+    Resumen aproximado de una columna no numérica con memoria fija, con la
+    misma interfaz que FrequencySummary: valores distintos con HyperLogLog y
+    más frecuentes con CountMinTopK, ambos con su cota de error.
+    """
+
+    # Los valores distintos siempre se estiman, nunca se truncan
+    distinct_exceeded = False
+    exact = False
+
+    def __init__(self):
+        """Inicializa los sketches."""
+        self.distinct_sketch = HyperLogLog()
+        self.frequency_sketch = CountMinTopK()
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Añade los valores de un bloque.
+
+        Args:
+            values (pd.Series): Valores de la columna en el bloque
+        """
+        values = values.dropna()
+        hashes = hash_values(values)
+        self.distinct_sketch.update(hashes)
+        self.frequency_sketch.update(values, hashes)
+
+    @property
+    def distinct(self) -> int:
+        """int: Valores distintos estimados."""
+        return self.distinct_sketch.estimate()
+
+    @property
+    def distinct_error(self) -> float:
+        """float: Error relativo al 95 % de distinct."""
+        return self.distinct_sketch.relative_error
+
+    @property
+    def error_bound(self) -> int:
+        """int: Sobreestimación máxima de los conteos de top."""
+        return self.frequency_sketch.error_bound
+
+    def top(self, k: int = 5) -> dict:
+        """
+        Valores más frecuentes.
+
+        Args:
+            k (int): Número de valores a devolver
+
+        Returns:
+            dict: Valor -> conteo estimado, de mayor a menor
+        """
+        return self.frequency_sketch.top(k)
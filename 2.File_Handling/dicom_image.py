@@ -0,0 +1,529 @@
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pydicom
+from PIL import Image
+from pydicom.tag import Tag
+
+# Elementos de píxeles nativos y tipo de dato de los que no dependen de Bits Allocated
+PIXEL_DATA_ELEMENTS = (
+    (Tag(0x7FE0, 0x0010), None),          # Pixel Data
+    (Tag(0x7FE0, 0x0008), np.float32),    # Float Pixel Data
+    (Tag(0x7FE0, 0x0009), np.float64),    # Double Float Pixel Data
+)
+
+# Longitud indefinida: Pixel Data encapsulado (comprimido)
+UNDEFINED_LENGTH = 0xFFFFFFFF
+
+# Entradas máximas de una tabla de build_window_lut: con rangos de valores
+# mayores (p. ej. enteros de 32 bits) frame_to_uint8 escala en float32
+MAX_LUT_SIZE = 1 << 16
+
+# Formatos de imagen de salida y su extensión (png16 tiene la suya para no
+# sobrescribir el PNG de 8 bits del mismo archivo)
+IMAGE_FORMATS = {'png': '.png', 'png16': '.16.png', 'tiff': '.tiff', 'webp': '.webp', 'npy': '.npy'}
+
+# Pseudo-tag de libtiff (TIFFTAG_ZIPQUALITY) con el nivel de la compresión
+# deflate; Pillow lo pasa a libtiff sin escribirlo en el archivo
+TIFF_ZIP_QUALITY = 65557
+
+# Formatos de 8 bits (con la ventana aplicada); el resto guarda los valores almacenados
+WINDOWED_FORMATS = ('png', 'webp')
+
+# Percentiles que calcula pixel_statistics por defecto
+DEFAULT_PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def frame_count(ds: pydicom.Dataset) -> int:
+    """
+    Número de frames de un dataset DICOM.
+
+    Args:
+        ds (pydicom.Dataset): Dataset DICOM
+
+    Returns:
+        int: NumberOfFrames, o 1 si el atributo no existe
+    """
+    try:
+        return max(int(ds.get('NumberOfFrames', 1) or 1), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def select_frames(total: int, frames: Union[None, int, range, slice, Iterable[int]] = None) -> List[int]:
+    """
+    Convierte una selección de frames en una lista de índices válidos.
+
+    Args:
+        total (int): Número de frames del archivo
+        frames: None (todos), un índice, un range, un slice o una lista de índices
+
+    Returns:
+        List[int]: Índices seleccionados, en el orden indicado
+
+    Raises:
+        IndexError: Si algún índice está fuera del archivo
+    """
+    if frames is None:
+        indices = list(range(total))
+    elif isinstance(frames, int):
+        indices = [frames]
+    elif isinstance(frames, slice):
+        indices = list(range(total))[frames]
+    else:
+        indices = list(frames)
+
+    for index in indices:
+        if not 0 <= index < total:
+            raise IndexError(f"El frame {index} no existe (el archivo tiene {total})")
+    return indices
+
+
+def memmap_pixels(file_path: Union[str, Path], ds: Optional[pydicom.Dataset] = None) -> Optional[np.ndarray]:
+    """
+    Vista de solo lectura (np.memmap) sobre los píxeles de un archivo DICOM
+    con sintaxis de transferencia nativa (sin comprimir).
+
+    No lee los píxeles: localiza el desplazamiento del elemento Pixel Data en
+    el archivo y lo proyecta en memoria, de modo que recortar, submuestrear o
+    calcular estadísticas solo lee del disco las páginas que se usan.
+
+    Args:
+        file_path (str | Path): Ruta del archivo DICOM
+        ds (pydicom.Dataset, optional): Dataset ya leído de ese archivo, con
+            Pixel Data sin acceder (p. ej. leído con defer_size); evita volver
+            a leer la cabecera
+
+    Returns:
+        np.ndarray | None: Array con la misma forma que pixel_array (frames,
+        filas, columnas[, muestras]), o None si los píxeles no se pueden
+        proyectar (sintaxis comprimida o deflated, 1 bit por píxel, YBR 4:2:2
+        o longitud insuficiente) y hay que decodificarlos. Los valores son las
+        palabras almacenadas: ver stored_values
+    """
+    # Los elementos grandes se difieren: Pixel Data queda sin leer y con su posición
+    if ds is None:
+        ds = pydicom.dcmread(file_path, defer_size=1024)
+    syntax = ds.file_meta.get('TransferSyntaxUID')
+    if syntax is None or syntax.is_compressed or syntax.is_deflated:
+        return None
+
+    for tag, float_dtype in PIXEL_DATA_ELEMENTS:
+        if tag in ds:
+            break
+    else:
+        return None
+
+    element = ds.get_item(tag, keep_deferred=True)
+    offset = getattr(element, 'value_tell', None)
+    if offset is None or element.length == UNDEFINED_LENGTH:
+        return None
+
+    bits = int(ds.BitsAllocated)
+    samples = int(ds.get('SamplesPerPixel', 1) or 1)
+    if bits not in (8, 16, 32, 64) or ds.get('PhotometricInterpretation') == 'YBR_FULL_422':
+        return None
+
+    if float_dtype is not None:
+        dtype = np.dtype(float_dtype)
+    else:
+        kind = 'i' if ds.get('PixelRepresentation', 0) == 1 else 'u'
+        dtype = np.dtype(f"{kind}{bits // 8}")
+    dtype = dtype.newbyteorder('<' if syntax.is_little_endian else '>')
+
+    frames = frame_count(ds)
+    rows, columns = int(ds.Rows), int(ds.Columns)
+    planar = samples > 1 and ds.get('PlanarConfiguration', 0) == 1
+    shape = (frames, samples, rows, columns) if planar else (frames, rows, columns, samples)
+    if element.length < int(np.prod(shape)) * dtype.itemsize:
+        return None
+
+    pixels = np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=shape)
+    if planar:
+        # Color por planos: reordenamos los ejes sin copiar
+        pixels = pixels.transpose(0, 2, 3, 1)
+
+    # Misma forma que pixel_array: sin eje de frames ni de muestras si valen 1
+    if samples == 1:
+        pixels = pixels[..., 0]
+    if frames == 1:
+        pixels = pixels[0]
+    return pixels
+
+
+def stored_values(pixels: np.ndarray, ds: pydicom.Dataset) -> np.ndarray:
+    """
+    Valores de una región de memmap_pixels tal como los devuelve pixel_array.
+
+    Si Bits Stored es menor que Bits Allocated, los bits superiores de cada
+    palabra pueden contener otros datos (p. ej. overlays): se descartan, con
+    extensión de signo si los píxeles son con signo. Solo se copia la región
+    pedida, no el archivo.
+
+    Args:
+        pixels (np.ndarray): Región (frame, recorte...) de memmap_pixels
+        ds (pydicom.Dataset): Dataset DICOM del archivo
+
+    Returns:
+        np.ndarray: Valores almacenados en memoria
+    """
+    pixels = np.asarray(pixels)
+    allocated = pixels.dtype.itemsize * 8
+    bits = int(ds.get('BitsStored', allocated) or allocated)
+    if not np.issubdtype(pixels.dtype, np.integer) or bits >= allocated:
+        return pixels
+
+    if np.issubdtype(pixels.dtype, np.signedinteger):
+        shift = allocated - bits
+        return (pixels << shift) >> shift
+    return pixels & ((1 << bits) - 1)
+
+
+def rescale_parameters(ds: pydicom.Dataset) -> Tuple[float, float]:
+    """
+    Pendiente y ordenada de la transformación de modalidad (Rescale Slope/Intercept).
+
+    Args:
+        ds (pydicom.Dataset): Dataset DICOM
+
+    Returns:
+        tuple: (slope, intercept), (1.0, 0.0) si no están definidos
+    """
+    slope = ds.get('RescaleSlope', 1)
+    intercept = ds.get('RescaleIntercept', 0)
+    return float(slope if slope not in (None, '') else 1), float(intercept if intercept not in (None, '') else 0)
+
+
+def window_parameters(ds: pydicom.Dataset) -> Optional[Tuple[float, float]]:
+    """
+    Primera ventana (Window Center/Width) definida en el dataset.
+
+    Args:
+        ds (pydicom.Dataset): Dataset DICOM
+
+    Returns:
+        tuple | None: (center, width), o None si el archivo no define ventana
+    """
+    center = ds.get('WindowCenter')
+    width = ds.get('WindowWidth')
+    if center in (None, '') or width in (None, ''):
+        return None
+
+    # Puede haber varias ventanas (MultiValue): usamos la primera
+    if isinstance(center, Sequence) and not isinstance(center, str):
+        center = center[0]
+    if isinstance(width, Sequence) and not isinstance(width, str):
+        width = width[0]
+    return float(center), float(width)
+
+
+def build_window_lut(low: int, high: int, slope: float = 1.0, intercept: float = 0.0,
+                     window: Optional[Tuple[float, float]] = None, invert: bool = False) -> np.ndarray:
+    """
+    Construye una tabla que transforma cada valor almacenado entre low y high
+    en un nivel de gris de 8 bits.
+
+    Aplica la transformación de modalidad (slope/intercept) y la ventana lineal
+    de DICOM (PS3.3 C.11.2.1.2). Sin ventana, reparte linealmente el rango
+    [low, high] en 0-255, como la normalización min/max.
+
+    Args:
+        low (int): Menor valor almacenado
+        high (int): Mayor valor almacenado
+        slope (float): Rescale Slope
+        intercept (float): Rescale Intercept
+        window (tuple, optional): (center, width) en unidades de modalidad
+        invert (bool): Si True, invierte la escala (MONOCHROME1)
+
+    Returns:
+        np.ndarray: Tabla uint8 de high - low + 1 entradas (ver MAX_LUT_SIZE)
+    """
+    stored = np.arange(low, high + 1, dtype=np.float64)
+
+    if window is None:
+        span = high - low
+        levels = (stored - low) / span * 255 if span else np.zeros_like(stored)
+    else:
+        center, width = window
+        values = stored * slope + intercept
+        width = max(width, 1.0)
+        levels = ((values - (center - 0.5)) / (width - 1 or 1) + 0.5) * 255
+        np.clip(levels, 0, 255, out=levels)
+
+    lut = levels.astype(np.uint8)
+    if invert:
+        np.subtract(255, lut, out=lut)
+    return lut
+
+
+def apply_lut(pixels: np.ndarray, lut: np.ndarray, low: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Transforma un frame de enteros en uint8 indexando la tabla.
+
+    El único temporal es el array de índices del propio frame; no se crean
+    copias en coma flotante.
+
+    Args:
+        pixels (np.ndarray): Valores almacenados (enteros)
+        lut (np.ndarray): Tabla de build_window_lut
+        low (int): Valor almacenado que corresponde a la entrada 0 de la tabla
+        out (np.ndarray, optional): Array uint8 de salida a reutilizar
+
+    Returns:
+        np.ndarray: Frame en uint8
+    """
+    indices = pixels.astype(np.intp)
+    if low:
+        indices -= low
+    return np.take(lut, indices, out=out)
+
+
+def frame_to_uint8(pixels: np.ndarray, slope: float = 1.0, intercept: float = 0.0,
+                   window: Optional[Tuple[float, float]] = None, invert: bool = False,
+                   value_range: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Convierte un frame de valores almacenados en una imagen de 8 bits.
+
+    Los enteros con un rango de hasta MAX_LUT_SIZE valores se transforman con
+    una tabla uint8; el resto de datos se escala en float32.
+
+    Args:
+        pixels (np.ndarray): Frame (filas x columnas, o con canales de color)
+        slope (float): Rescale Slope
+        intercept (float): Rescale Intercept
+        window (tuple, optional): (center, width); sin ventana se usa min/max
+        invert (bool): Si True, invierte la escala (MONOCHROME1)
+        value_range (tuple, optional): (low, high) compartido por varios
+            frames; por defecto el min/max de este frame
+
+    Returns:
+        np.ndarray: Frame en uint8
+    """
+    if pixels.dtype == np.uint8 and window is None and not invert:
+        return pixels
+
+    if np.issubdtype(pixels.dtype, np.integer):
+        low, high = value_range if value_range else (int(pixels.min()), int(pixels.max()))
+        if high - low < MAX_LUT_SIZE:
+            lut = build_window_lut(low, high, slope, intercept, window, invert)
+            return apply_lut(np.clip(pixels, low, high) if value_range else pixels, lut, low)
+        # Rango demasiado amplio para una tabla: el rango pasa a unidades de modalidad
+        if value_range:
+            value_range = tuple(sorted((low * slope + intercept, high * slope + intercept)))
+
+    # Datos en coma flotante o rangos amplios: transformamos en float32
+    values = pixels.astype(np.float32)
+    values *= slope
+    values += intercept
+    if window is None:
+        low, high = value_range if value_range else (float(values.min()), float(values.max()))
+        center, width = (low + high) / 2 + 0.5, (high - low) + 1
+    else:
+        center, width = window
+    values -= center - 0.5
+    values /= max(width - 1, 1)
+    values += 0.5
+    values *= 255
+    np.clip(values, 0, 255, out=values)
+    levels = values.astype(np.uint8)
+    if invert:
+        np.subtract(255, levels, out=levels)
+    return levels
+
+
+def slice_position(ds: pydicom.Dataset) -> float:
+    """
+    Posición de un corte a lo largo de la normal del plano de la imagen, para
+    ordenar una serie. Si faltan los atributos de geometría, usa InstanceNumber.
+
+    Args:
+        ds (pydicom.Dataset): Dataset DICOM del corte
+
+    Returns:
+        float: Posición del corte
+    """
+    position = ds.get('ImagePositionPatient')
+    orientation = ds.get('ImageOrientationPatient')
+    if position is not None and orientation is not None and len(orientation) == 6:
+        row = np.array(orientation[:3], dtype=float)
+        column = np.array(orientation[3:], dtype=float)
+        return float(np.dot(np.cross(row, column), np.array(position, dtype=float)))
+    return float(ds.get('InstanceNumber', 0) or 0)
+
+
+def pixel_value_counts(pixels: np.ndarray, ds: Optional[pydicom.Dataset] = None,
+                       tile_rows: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valores distintos de un frame y sus apariciones, en una sola pasada.
+
+    Los enteros de hasta 16 bits se cuentan con np.bincount sobre todo el rango
+    del tipo (tiempo lineal, sin ordenar); el resto con np.unique. Con
+    tile_rows el frame se recorre por bloques de filas: de un memmap solo hay
+    un bloque en memoria a la vez.
+
+    Args:
+        pixels (np.ndarray): Frame (filas x columnas[, muestras])
+        ds (pydicom.Dataset, optional): Si se indica, cada bloque pasa por
+            stored_values (para regiones de memmap_pixels)
+        tile_rows (int, optional): Filas por bloque; None procesa el frame entero
+
+    Returns:
+        tuple: (valores en orden ascendente, número de apariciones de cada uno)
+    """
+    rows = pixels.shape[0]
+    step = tile_rows or rows or 1
+    dtype = pixels.dtype
+
+    def tiles():
+        for start in range(0, rows, step):
+            tile = pixels[start:start + step]
+            yield np.asarray(stored_values(tile, ds) if ds is not None else tile).ravel()
+
+    if np.issubdtype(dtype, np.integer) and dtype.itemsize <= 2:
+        # El conteo se indexa por valor; los enteros con signo se desplazan
+        offset = -int(np.iinfo(dtype).min)
+        counts = np.zeros(1 << (8 * dtype.itemsize), dtype=np.int64)
+        for tile in tiles():
+            if offset:
+                tile = tile.astype(np.int32) + offset
+            counts += np.bincount(tile, minlength=len(counts))
+        values = np.flatnonzero(counts)
+        return values - offset, counts[values]
+
+    values = np.empty(0, dtype=dtype)
+    counts = np.empty(0, dtype=np.int64)
+    for tile in tiles():
+        tile_values, tile_counts = np.unique(tile, return_counts=True)
+        values, inverse = np.unique(np.concatenate([values, tile_values]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([counts, tile_counts])).astype(np.int64)
+    return values, counts
+
+
+def pixel_statistics(values: np.ndarray, counts: np.ndarray, slope: float = 1.0, intercept: float = 0.0,
+                     percentiles: Sequence[float] = DEFAULT_PERCENTILES, bins: int = 256,
+                     hist_range: Optional[Tuple[float, float]] = None) -> dict:
+    """
+    Estadísticas de intensidad de un frame a partir de pixel_value_counts.
+
+    Los valores se pasan a unidades de modalidad (value * slope + intercept)
+    antes de calcular. Los percentiles son exactos (misma interpolación lineal
+    que np.percentile) porque se obtienen de los conteos acumulados.
+
+    Args:
+        values (np.ndarray): Valores distintos almacenados
+        counts (np.ndarray): Apariciones de cada valor
+        slope (float): Rescale Slope
+        intercept (float): Rescale Intercept
+        percentiles (Sequence[float]): Percentiles a calcular (0 a 100)
+        bins (int): Número de intervalos del histograma
+        hist_range (tuple, optional): (mínimo, máximo) del histograma; por
+            defecto el rango del frame. Fijarlo hace comparables los histogramas
+
+    Returns:
+        dict: 'pixels', 'min', 'max', 'mean', 'std', 'percentiles'
+        ({percentil: valor}), 'histogram' (conteos) y 'bin_edges'
+    """
+    modality = values.astype(np.float64) * slope + intercept
+    if slope < 0:
+        modality, counts = modality[::-1], counts[::-1]
+
+    total = int(counts.sum())
+    if not total:
+        return {'pixels': 0, 'min': None, 'max': None, 'mean': None, 'std': None,
+                'percentiles': {}, 'histogram': [], 'bin_edges': []}
+
+    mean = float(np.dot(modality, counts) / total)
+    std = float(np.sqrt(np.dot((modality - mean) ** 2, counts) / total))
+
+    # Percentil q: interpolación entre los valores de rango floor(h) y floor(h) + 1,
+    # con h = (n - 1) * q / 100; el valor de rango r es el primero cuyo acumulado supera r
+    cumulative = np.cumsum(counts)
+    positions = (total - 1) * np.asarray(percentiles, dtype=np.float64) / 100
+    lower = np.floor(positions)
+    low_values = modality[np.searchsorted(cumulative, lower, side='right')]
+    high_values = modality[np.searchsorted(cumulative, np.minimum(lower + 1, total - 1), side='right')]
+    quantiles = low_values + (positions - lower) * (high_values - low_values)
+
+    histogram, edges = np.histogram(modality, bins=bins, range=hist_range, weights=counts)
+    return {
+        'pixels': total,
+        'min': float(modality[0]),
+        'max': float(modality[-1]),
+        'mean': mean,
+        'std': std,
+        'percentiles': {q: float(value) for q, value in zip(percentiles, quantiles)},
+        'histogram': histogram.astype(np.int64).tolist(),
+        'bin_edges': edges.tolist(),
+    }
+
+
+def check_image_format(image_format: str) -> str:
+    """
+    Comprueba un formato de imagen de salida.
+
+    Args:
+        image_format (str): Formato ('png', 'png16', 'tiff', 'webp' o 'npy')
+
+    Returns:
+        str: Extensión del formato
+
+    Raises:
+        ValueError: Si el formato no existe
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Formato de imagen desconocido: {image_format} (opciones: {', '.join(IMAGE_FORMATS)})")
+    return IMAGE_FORMATS[image_format]
+
+
+def save_image(pixels: np.ndarray, path: Union[str, Path], image_format: str = 'png',
+               compression: Optional[int] = None) -> None:
+    """
+    Guarda un frame sin pérdidas en el formato indicado.
+
+    - 'png' y 'webp' (WebP sin pérdidas, que guarda la escala de grises como
+      RGB): frames de 8 bits (ver frame_to_uint8).
+    - 'png16': PNG de 16 bits en escala de grises; los enteros con signo se
+      desplazan 32768 para guardarse sin signo.
+    - 'tiff': el tipo de dato original (enteros o coma flotante).
+    - 'npy': el array tal cual, con np.save (lo más rápido).
+
+    Args:
+        pixels (np.ndarray): Frame a guardar
+        path (str | Path): Ruta del archivo
+        image_format (str): Formato de salida
+        compression (int, optional): Nivel de compresión de 0 (ninguna, más
+            rápido) a 9 (máxima); None usa el valor por defecto de Pillow (en
+            TIFF, sin compresión). En WebP se traduce al parámetro method (0-6)
+            y en TIFF, de 1 a 9, es el nivel de la compresión deflate
+
+    Raises:
+        ValueError: Si el formato no existe, no admite el frame o el nivel de
+            compresión no está entre 0 y 9
+    """
+    check_image_format(image_format)
+    if compression is not None and not 0 <= compression <= 9:
+        raise ValueError(f"Nivel de compresión fuera de rango: {compression} (de 0 a 9)")
+    if image_format == 'npy':
+        np.save(path, pixels)
+        return
+
+    options = {}
+    if image_format == 'png16':
+        if pixels.ndim != 2 or not np.issubdtype(pixels.dtype, np.integer) or pixels.dtype.itemsize > 2:
+            raise ValueError("El PNG de 16 bits solo admite frames en escala de grises de hasta 16 bits")
+        if np.issubdtype(pixels.dtype, np.signedinteger):
+            pixels = (pixels.astype(np.int32) + 32768).astype(np.uint16)
+        else:
+            pixels = pixels.astype(np.uint16, copy=False)
+    if image_format in ('png', 'png16') and compression is not None:
+        options['compress_level'] = compression
+    elif image_format == 'webp':
+        options['lossless'] = True
+        if compression is not None:
+            options['method'] = round(compression * 6 / 9)
+    elif image_format == 'tiff' and compression:
+        options['compression'] = 'tiff_adobe_deflate'
+        options['tiffinfo'] = {TIFF_ZIP_QUALITY: compression}
+
+    Image.fromarray(pixels).save(path, format='PNG' if image_format == 'png16' else image_format.upper(), **options)
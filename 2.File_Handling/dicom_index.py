@@ -0,0 +1,239 @@
+import json
+import logging
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from file_processor import FileProcessor, DICOM_SUFFIXES, MISSING_ATTRIBUTE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dicom_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    patient_name TEXT,
+    study_date TEXT,
+    modality TEXT,
+    tags TEXT,
+    error TEXT,
+    indexed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dicom_files_modality_date ON dicom_files (modality, study_date);
+CREATE INDEX IF NOT EXISTS idx_dicom_files_study_date ON dicom_files (study_date);
+"""
+
+# Atributos de la tabla que quedan a NULL si el archivo no los tiene
+ATTRIBUTE_COLUMNS = ('patient_name', 'study_date', 'modality')
+
+# Un archivo DICOM Part 10 tiene 128 bytes de preámbulo seguidos de "DICM"
+DICOM_PREAMBLE_SIZE = 128
+DICOM_MAGIC = b"DICM"
+
+
+def has_dicom_preamble(file_path: Path) -> bool:
+    """
+    Indica si un archivo empieza como un DICOM Part 10 (preámbulo y "DICM").
+
+    Args:
+        file_path (Path): Archivo a comprobar
+
+    Returns:
+        bool: True si el archivo tiene el prefijo DICM
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            f.seek(DICOM_PREAMBLE_SIZE)
+            return f.read(len(DICOM_MAGIC)) == DICOM_MAGIC
+    except OSError:
+        return False
+
+
+def _attribute_value(analysis: dict, column: str) -> Optional[str]:
+    """Valor de un atributo para el índice: None si falta o está vacío."""
+    value = analysis.get(column)
+    if value in (None, "", MISSING_ATTRIBUTE):
+        return None
+    return value
+
+
+class DicomIndex:
+    """
+    Índice persistente en SQLite de los metadatos DICOM de un árbol de carpetas.
+    Cada archivo se identifica por su ruta, fecha de modificación y tamaño, de
+    modo que al volver a escanear solo se leen los archivos nuevos o modificados
+    y las consultas no necesitan abrir los archivos DICOM.
+
+    Los atributos que faltan en un archivo se guardan como NULL, por lo que
+    los filtros de query no los seleccionan.
+    """
+
+    def __init__(self, processor: FileProcessor, index_path: str = "dicom_index.sqlite",
+                 tags: Optional[List[Tuple[int, int]]] = None):
+        """
+        Inicializa el índice y crea la base de datos si no existe.
+
+        Args:
+            processor (FileProcessor): Procesador usado para leer los archivos
+            index_path (str): Ruta del archivo SQLite del índice
+            tags (List[Tuple[int, int]], optional): Tags adicionales a guardar
+                junto a paciente, fecha de estudio y modalidad
+        """
+        self.processor = processor
+        self.index_path = Path(index_path)
+        self.tags = list(tags or [])
+        self.logger = logging.getLogger(__name__)
+
+        self.connection = sqlite3.connect(self.index_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def scan(self, folder_name: str = ".", workers: int = 1, detect_by_content: bool = False) -> dict:
+        """
+        Recorre una carpeta (recursivamente) y actualiza el índice.
+
+        Solo se leen los archivos cuya fecha de modificación o tamaño cambió
+        desde el último escaneo; los que ya no existen se eliminan del índice.
+        Por defecto solo se consideran DICOM los archivos con extensión .dcm o
+        .dicom; con detect_by_content también los demás archivos que tengan el
+        prefijo "DICM" tras el preámbulo de 128 bytes (lo que obliga a abrir
+        cada archivo sin esas extensiones en cada escaneo).
+
+        Args:
+            folder_name (str): Carpeta a recorrer, relativa a la ruta base del procesador
+            workers (int): Número de procesos para leer los archivos modificados
+            detect_by_content (bool): Detectar también los DICOM sin extensión
+                por su preámbulo
+
+        Returns:
+            dict: Número de archivos añadidos, actualizados, eliminados y sin
+            cambios, y lista de errores de lectura
+        """
+        base_path = self.processor.base_path
+        folder_path = base_path / folder_name
+        prefix = str(folder_path.relative_to(base_path))
+
+        # Estado actual en disco: ruta relativa -> (mtime, tamaño)
+        on_disk = {}
+        for root, _, filenames in os.walk(folder_path):
+            for filename in filenames:
+                full_path = Path(root) / filename
+                if Path(filename).suffix.lower() not in DICOM_SUFFIXES and not (
+                        detect_by_content and has_dicom_preamble(full_path)):
+                    continue
+                stat = full_path.stat()
+                on_disk[str(full_path.relative_to(base_path))] = (stat.st_mtime, stat.st_size)
+
+        # Estado indexado de la misma carpeta
+        indexed = {
+            row['path']: (row['mtime'], row['size'])
+            for row in self.connection.execute("SELECT path, mtime, size FROM dicom_files")
+            if prefix == "." or row['path'] == prefix or row['path'].startswith(prefix + os.sep)
+        }
+
+        changed = [path for path, signature in on_disk.items() if indexed.get(path) != signature]
+        removed = [path for path in indexed if path not in on_disk]
+
+        options = {'summary': False, 'chunksize': None, 'tags': self.tags, 'extract_image': False, 'dicom': True}
+        tasks = [(path, options) for path in changed]
+        if workers == 1:
+            results = map(self.processor._process_file, tasks)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(self.processor._process_file, tasks, chunksize=16)
+
+        rows = []
+        errors = []
+        indexed_at = datetime.now().isoformat(timespec='seconds')
+        try:
+            for result in results:
+                path = result['file']
+                mtime, size = on_disk[path]
+                analysis = result['result'] or {}
+                if result['error']:
+                    errors.append({'file': path, 'error': result['error']})
+                rows.append((
+                    path, mtime, size,
+                    *(_attribute_value(analysis, column) for column in ATTRIBUTE_COLUMNS),
+                    json.dumps(FileProcessor._to_json(analysis.get('tags', {}))),
+                    result['error'],
+                    indexed_at,
+                ))
+        finally:
+            if workers != 1:
+                executor.shutdown()
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO dicom_files "
+                "(path, mtime, size, patient_name, study_date, modality, tags, error, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.connection.executemany("DELETE FROM dicom_files WHERE path = ?", [(path,) for path in removed])
+
+        for error in errors:
+            self.logger.error(f"Error al indexar '{error['file']}': {error['error']}")
+
+        added = sum(1 for path in changed if path not in indexed)
+        return {
+            'added': added,
+            'updated': len(changed) - added,
+            'removed': len(removed),
+            'unchanged': len(on_disk) - len(changed),
+            'errors': errors,
+        }
+
+    def query(self, modality: Optional[str] = None, date_from: Optional[str] = None,
+              date_to: Optional[str] = None, patient_name: Optional[str] = None) -> List[dict]:
+        """
+        Busca estudios en el índice sin abrir los archivos DICOM.
+
+        Args:
+            modality (str, optional): Modalidad exacta (p. ej. "CT")
+            date_from (str, optional): Fecha de estudio mínima, formato YYYYMMDD
+            date_to (str, optional): Fecha de estudio máxima (incluida), formato YYYYMMDD
+            patient_name (str, optional): Patrón de nombre de paciente (SQL LIKE, p. ej. "%DEMO%")
+
+        Returns:
+            List[dict]: Archivos que cumplen los filtros, ordenados por fecha y ruta
+        """
+        conditions = ["error IS NULL"]
+        params = []
+        if modality is not None:
+            conditions.append("modality = ?")
+            params.append(modality)
+        if date_from is not None:
+            conditions.append("study_date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("study_date <= ?")
+            params.append(date_to)
+        if patient_name is not None:
+            conditions.append("patient_name LIKE ?")
+            params.append(patient_name)
+
+        sql = ("SELECT path, patient_name, study_date, modality, tags FROM dicom_files "
+               f"WHERE {' AND '.join(conditions)} ORDER BY study_date, path")
+
+        results = []
+        for row in self.connection.execute(sql, params):
+            entry = dict(row)
+            entry['tags'] = json.loads(entry['tags']) if entry['tags'] else {}
+            results.append(entry)
+        return results
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM dicom_files WHERE error IS NULL").fetchone()[0]
+
+    def close(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,13 +1,61 @@
 import os
 import logging
-import csv
-from datetime import datetime
-from typing import List, Tuple, Optional
+import fnmatch
+import json
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from typing import Callable, Iterator, List, NamedTuple, Sequence, Tuple, Optional
 import pandas as pd
 import numpy as np
 import pydicom
-from PIL import Image
+from pydicom.pixels import iter_pixels, pixel_array
+from pydicom.tag import Tag
 from pathlib import Path
+from csv_stats import RunningMoments, FrequencySummary, ReservoirSample, SketchSummary, value_frequencies
+import columnar_cache
+from results import Result, CsvResult, DicomResult, PixelStatsResult, FolderListing, ConsoleRenderer
+from metrics import StageTimer, MetricsSummary, NULL_TIMER
+from result_cache import ResultCache
+from dicom_image import (PIXEL_DATA_ELEMENTS, DEFAULT_PERCENTILES, frame_count, select_frames, memmap_pixels,
+                         stored_values, rescale_parameters, window_parameters, frame_to_uint8, slice_position,
+                         pixel_value_counts, pixel_statistics, IMAGE_FORMATS, WINDOWED_FORMATS,
+                         check_image_format, save_image)
+
+# Extensiones que process_folder trata como DICOM
+DICOM_SUFFIXES = ('.dcm', '.dicom')
+
+# Extensiones que analiza process_folder; los demás archivos se omiten
+ANALYZED_SUFFIXES = ('.csv',) + DICOM_SUFFIXES
+
+# Atributos que read_dicom muestra siempre
+DICOM_HEADER_KEYWORDS = ('PatientName', 'StudyDate', 'Modality')
+
+# Texto que se muestra en lugar de un atributo DICOM ausente
+MISSING_ATTRIBUTE = "No disponible"
+
+# Tag PixelData (7FE0,0010): la lectura de solo cabecera se detiene aquí
+PIXEL_DATA_TAG = Tag(0x7FE0, 0x0010)
+
+# Tamaño a partir del cual la lectura de solo cabecera difiere los elementos
+DICOM_DEFER_SIZE = '1 KB'
+
+# Formatos del reporte de read_csv
+REPORT_FORMATS = ('txt', 'json', 'parquet')
+
+# Filas por bloque del modo aproximado de read_csv si no se indica chunksize
+APPROXIMATE_CHUNKSIZE = 100_000
+
+# Valor por defecto de renderer: cada procesador crea su propio ConsoleRenderer
+_DEFAULT_RENDERER = object()
+
+class FolderEntry(NamedTuple):
+    """Elemento de una carpeta devuelto por FileProcessor.iter_folder."""
+    path: str            # Ruta completa
+    name: str            # Ruta relativa a la carpeta recorrida
+    type: str            # 'file', 'folder' u 'other'
+    size: Optional[int]  # Tamaño en bytes (solo archivos y con details=True)
+    mtime: Optional[float]
+    depth: int
 
 class FileProcessor:
     """
@@ -15,263 +63,1427 @@ class FileProcessor:
     Esta clase permite analizar archivos, listar contenido de carpetas y extraer información.
     """
     
-    def __init__(self, base_path: str, log_file: str = "file_processor.log"):
+    def __init__(self, base_path: str, log_file: str = "file_processor.log",
+                 renderer: Optional[ConsoleRenderer] = _DEFAULT_RENDERER, metrics: bool = False,
+                 trace_memory: bool = False, on_metrics: Optional[Callable[[str, dict], None]] = None,
+                 result_cache: Optional[ResultCache] = None):
         """
         Inicializa el procesador de archivos.
         
         Args:
             base_path (str): Ruta base donde están los archivos
             log_file (str): Nombre del archivo donde se guardarán los logs
+            renderer (ConsoleRenderer, optional): Muestra resultados y mensajes
+                (por defecto, un ConsoleRenderer nuevo); None para usar el procesador como librería, sin salida por consola
+            metrics (bool): Si True, mide el tiempo de cada etapa de read_csv,
+                read_dicom y process_folder (ver metrics.StageTimer)
+            trace_memory (bool): Con metrics, mide también la memoria pico de
+                cada etapa con tracemalloc (más lento)
+            on_metrics (callable, optional): Función (archivo, métricas) llamada
+                tras cada archivo medido
+            result_cache (ResultCache, optional): Caché en disco de los análisis
+                de read_csv, read_dicom y process_folder, compartible entre procesos
         """
         # Guardamos la ruta base donde están nuestros archivos
         self.base_path = Path(base_path)
+        self.renderer = ConsoleRenderer() if renderer is _DEFAULT_RENDERER else renderer
+        
+        # Instrumentación: métricas por archivo y resumen acumulado
+        self.metrics = metrics
+        self.trace_memory = trace_memory
+        self.on_metrics = on_metrics
+        self.metrics_summary = MetricsSummary()
+        self.result_cache = result_cache
         
-        # Configuramos el sistema de logging para registrar errores
+        # Configuramos el sistema de logging para registrar errores. La consola
+        # es cosa del renderizador: así cada error se muestra una sola vez
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()  # También muestra en consola
-            ]
+            handlers=[logging.FileHandler(log_file)]
         )
         self.logger = logging.getLogger(__name__)
         
         # Creamos la carpeta base si no existe
         self.base_path.mkdir(parents=True, exist_ok=True)
         
-        print(f"FileProcessor iniciado con ruta base: {self.base_path}")
+        self._show(f"FileProcessor iniciado con ruta base: {self.base_path}")
+        
+    def _finish(self, result: Result) -> Result:
+        """
+        Registra el error de un resultado (una sola vez, en el log) y lo pasa
+        al renderizador, si hay uno.
+        
+        Args:
+            result (Result): Resultado de read_csv, read_dicom, dicom_pixel_stats
+                o list_folder_contents
+        
+        Returns:
+            Result: El mismo resultado
+        """
+        if result.error is not None:
+            self.logger.error(result.error)
+        if self.renderer is not None:
+            self.renderer.render(result)
+        return result
+    
+    def _show(self, text: str) -> None:
+        """Muestra un mensaje informativo con el renderizador, si hay uno."""
+        if self.renderer is not None:
+            self.renderer.message(text)
+    
+    def _fail(self, error_msg: str) -> None:
+        """Registra un error en el log y lo muestra con el renderizador, si hay uno."""
+        self.logger.error(error_msg)
+        if self.renderer is not None:
+            self.renderer.error(error_msg)
+    
+    def _stage_timer(self):
+        """Medidor de etapas para un análisis (vacío si las métricas están desactivadas)."""
+        return StageTimer(memory=self.trace_memory) if self.metrics else NULL_TIMER
+    
+    def _record_metrics(self, filename: str, metrics: Optional[dict]) -> None:
+        """
+        Añade las métricas de un archivo al resumen acumulado y llama a on_metrics.
         
-    def list_folder_contents(self, folder_name: str, details: bool = False) -> None:
+        Args:
+            filename (str): Archivo medido
+            metrics (dict, optional): Métricas del archivo (vacías si no se midió)
+        """
+        if not metrics or not metrics['seconds']:
+            return
+        self.metrics_summary.add(metrics)
+        if self.on_metrics is not None:
+            self.on_metrics(filename, metrics)
+    
+    def _cached_analysis(self, kind: str, file_path: Path, params: dict, analyze: Callable[[], dict],
+                         stages=NULL_TIMER, image_target: Optional[Path] = None) -> dict:
+        """
+        Devuelve el análisis de result_cache o lo calcula y lo guarda en ella.
+        
+        Args:
+            kind (str): Tipo de análisis ('csv' o 'dicom')
+            file_path (Path): Archivo analizado
+            params (dict): Parámetros que afectan al resultado
+            analyze (callable): Calcula el análisis si no está en la caché
+            stages (StageTimer, optional): Medidor de la etapa 'cache'
+            image_target (Path, optional): Dónde restaurar la imagen extraída
+                guardada en la caché
+        
+        Returns:
+            dict: Análisis
+        """
+        if self.result_cache is None:
+            return analyze()
+        
+        with stages('cache'):
+            key = self.result_cache.key(file_path, kind, params)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                analysis, image = cached
+                if image is not None and image_target is not None:
+                    # La imagen se restaura solo si falta o no es la misma
+                    if not image_target.exists() or image_target.stat().st_size != image.stat().st_size:
+                        shutil.copyfile(image, image_target)
+                    analysis['image_path'] = str(image_target)
+                self.logger.info(f"Análisis desde la caché: {file_path}")
+                return analysis
+        
+        analysis = analyze()
+        
+        # Los análisis con errores de imagen no se guardan: se reintentan
+        if not analysis.get('image_error'):
+            with stages('cache'):
+                self.result_cache.put(key, analysis, analysis.get('image_path'))
+        return analysis
+    
+    def __getstate__(self):
+        # El callback se llama en el proceso principal: no viaja a los procesos del pool
+        state = self.__dict__.copy()
+        state['on_metrics'] = None
+        return state
+    
+    def list_folder_contents(self, folder_name: str, details: bool = False, recursive: bool = False,
+                             max_depth: Optional[int] = None) -> FolderListing:
       """
       Lista el contenido de una carpeta específica.
       
       Args:
           folder_name (str): Nombre de la carpeta a listar
-          details (bool): Si True, muestra detalles adicionales como tamaño y fecha
+          details (bool): Si True, incluye detalles adicionales como tamaño y fecha
+          recursive (bool): Si True, lista también el contenido de las subcarpetas
+          max_depth (int, optional): Con recursive, profundidad máxima (0 = solo
+              la carpeta indicada); None no limita la profundidad
+      
+      Returns:
+          FolderListing: Archivos y carpetas (elementos FolderEntry); si hubo un
+          error, solo el mensaje en error (y el resultado es falso)
       """
+      # Construimos la ruta completa de la carpeta
+      folder_path = self.base_path / folder_name
+      result = FolderListing(folder=str(folder_path), details=details)
       try:
-        # Construimos la ruta completa de la carpeta
-        folder_path = self.base_path / folder_name
-        
         # Verificamos si la carpeta existe
         if not folder_path.exists():
-          error_msg = f"La carpeta '{folder_path}' no existe"
-          self.logger.error(error_msg)
-          print(f"ERROR: {error_msg}")
-          return
-        
-        # Obtenemos todos los elementos en la carpeta
-        items = list(folder_path.iterdir())
-        
-        # Separamos archivos y carpetas
-        files = [item for item in items if item.is_file()]
-        folders = [item for item in items if item.is_dir()]
-        
-        # Mostramos el resumen
-        print(f"\nCarpeta: {folder_path}")
-        print(f"Número de elementos: {len(items)}")
-        
-        # Mostramos archivos
-        if files:
-          print("Archivos:")
-          for file in files:
-            if details:
-              # Obtenemos el tamaño en MB
-              size_mb = file.stat().st_size / (1024 * 1024)
-              # Obtenemos la fecha de modificación
-              mod_time = datetime.fromtimestamp(file.stat().st_mtime)
-              print(f" - {file.name} ({size_mb:.2f} MB, Modificado: {mod_time.strftime('%Y-%m-%d %H:%M:%S')})")
-            else:
-              print(f" - {file.name}")
+          result.error = f"La carpeta '{folder_path}' no existe"
+        else:
+          # Obtenemos los archivos y carpetas (una sola lectura del directorio)
+          for entry in self.iter_folder(folder_name, details=details, recursive=recursive, max_depth=max_depth):
+            if entry.type == 'file':
+              result.files.append(entry)
+            elif entry.type == 'folder':
+              result.folders.append(entry)
+      except Exception as e:
+        result = FolderListing(folder=str(folder_path), details=details,
+                               error=f"Error al listar contenido de carpeta: {str(e)}")
+      
+      return self._finish(result)
+    
+    def iter_folder(self, folder_name: str = ".", details: bool = True, recursive: bool = False,
+                    max_depth: Optional[int] = None) -> Iterator[FolderEntry]:
+      """
+      Recorre una carpeta con os.scandir y devuelve sus elementos sin mostrarlos.
+      
+      El tipo de cada elemento sale de la propia lectura del directorio, sin
+      llamadas adicionales al sistema, y con details=True se hace una sola
+      llamada a stat por elemento (cacheada en el DirEntry); los elementos
+      cuyo stat falla (p. ej. enlaces rotos) se devuelven como 'other' sin
+      tamaño ni fecha. Las subcarpetas
+      se recorren en profundidad sin seguir enlaces simbólicos; las que no se
+      pueden leer se registran en el log y se omiten.
+      
+      Args:
+          folder_name (str): Carpeta a recorrer, relativa a base_path
+          details (bool): Si True, incluye tamaño (archivos) y fecha de modificación
+          recursive (bool): Si True, recorre también las subcarpetas
+          max_depth (int, optional): Con recursive, profundidad máxima (0 = solo
+              la carpeta indicada); None no limita la profundidad
+      
+      Yields:
+          FolderEntry: Elementos de la carpeta (y de sus subcarpetas)
+      
+      Raises:
+          FileNotFoundError: Si la carpeta no existe
+      """
+      folder_path = self.base_path / folder_name
+      if not recursive:
+        max_depth = 0
+      
+      pending = [(str(folder_path), "", 0)]
+      while pending:
+        path, prefix, depth = pending.pop()
+        try:
+          entries = os.scandir(path)
+        except OSError as e:
+          if depth == 0:
+            raise
+          self.logger.error(f"No se pudo leer la carpeta '{path}': {e}")
+          continue
         
-        # Mostramos carpetas
-        if folders:
-          print("Carpetas:")
-          for folder in folders:
-            if details:
-              mod_time = datetime.fromtimestamp(folder.stat().st_mtime)
-              print(f" - {folder.name} (Modificado: {mod_time.strftime('%Y-%m-%d %H:%M:%S')})")
+        subfolders = []
+        with entries:
+          for entry in entries:
+            name = prefix + entry.name
+            if entry.is_file():
+              kind = 'file'
+            elif entry.is_dir():
+              kind = 'folder'
+              if (max_depth is None or depth < max_depth) and not entry.is_symlink():
+                subfolders.append((entry.path, name + os.sep, depth + 1))
             else:
-              print(f" - {folder.name}")         
-      except Exception as e:
-        error_msg = f"Error al listar contenido de carpeta: {str(e)}"
-        self.logger.error(error_msg)
-        print(f"ERROR: {error_msg}")
+              kind = 'other'
+            
+            size = mtime = None
+            if details:
+              try:
+                stat = entry.stat()
+              except OSError:
+                # Enlace simbólico roto o elemento borrado durante el recorrido
+                kind = 'other'
+              else:
+                mtime = stat.st_mtime
+                if kind == 'file':
+                  size = stat.st_size
+            yield FolderEntry(entry.path, name, kind, size, mtime, depth)
+        
+        # Las subcarpetas se recorren en el orden en que aparecieron
+        pending.extend(reversed(subfolders))
     
-    def read_csv(self, filename: str, report_path: Optional[str] = None, summary: bool = False) -> None:
+    def _folder_files(self, folder_name: str, pattern: str,
+                      suffixes: Optional[Sequence[str]] = None) -> List[Path]:
+      """
+      Archivos de una carpeta (sin subcarpetas) cuyo nombre cumple un patrón,
+      ordenados por nombre.
+      
+      Args:
+          folder_name (str): Carpeta, relativa a base_path
+          pattern (str): Patrón de nombre de archivo (p. ej. "*.dcm")
+          suffixes (Sequence[str], optional): Si se indica, solo los archivos
+              con una de estas extensiones (en minúsculas)
+      
+      Returns:
+          List[Path]: Rutas de los archivos
+      """
+      return sorted(
+        Path(entry.path) for entry in self.iter_folder(folder_name, details=False)
+        if entry.type == 'file' and fnmatch.fnmatch(entry.name, pattern)
+        and (suffixes is None or Path(entry.name).suffix.lower() in suffixes)
+      )
+    
+    def read_csv(self, filename: str, report_path: Optional[str] = None, summary: bool = False,
+                 chunksize: Optional[int] = None, cache: Optional[str] = None,
+                 report_format: str = "txt", approximate: bool = False) -> CsvResult:
         """
         Lee y analiza un archivo CSV.
         
         Args:
             filename (str): Nombre del archivo CSV
             report_path (str, optional): Ruta donde guardar el reporte
-            summary (bool): Si True, muestra resumen de columnas no numéricas
+            summary (bool): Si True, resume también las columnas no numéricas
+            chunksize (int, optional): Si se indica, lee el archivo en bloques de
+                este número de filas con memoria acotada (para archivos mayores
+                que la RAM); las frecuencias de columnas no numéricas pasan a
+                ser aproximadas
+            cache (str, optional): 'parquet' o 'feather': convierte el CSV una vez
+                en una caché columnar (en '.csv_cache/', invalidada al cambiar la
+                fecha de modificación o el tamaño del CSV) y lee de ella solo las
+                columnas necesarias. Requiere pyarrow
+            report_format (str): Formato del reporte: 'txt' (columnas numéricas),
+                'json' o 'parquet' (estadísticas de todas las columnas analizadas)
+            approximate (bool): Si True, lee por bloques (de chunksize filas, o
+                APPROXIMATE_CHUNKSIZE) y estima las estadísticas con memoria fija:
+                media y desviación estándar de una muestra de reservorio con su
+                margen al 95 %, valores únicos con HyperLogLog y más frecuentes
+                con un sketch Count-Min, con sus cotas de error en el reporte
+        
+        Returns:
+            CsvResult: Estadísticas del archivo y ruta del reporte; si hubo un
+            error, solo el mensaje en error (y el resultado es falso)
         """
+        result = CsvResult(file=filename)
+        stages = self._stage_timer()
         try:
             # Construimos la ruta completa del archivo
             file_path = self.base_path / filename
             
             # Verificamos si el archivo existe
             if not file_path.exists():
-                error_msg = f"El archivo '{file_path}' no existe"
-                self.logger.error(error_msg)
-                print(f"ERROR: {error_msg}")
-                return
-            
+                result.error = f"El archivo '{file_path}' no existe"
             # Verificamos que sea un archivo CSV
-            if not file_path.suffix.lower() == '.csv':
-                error_msg = f"El archivo '{filename}' no es un archivo CSV válido"
-                self.logger.error(error_msg)
-                print(f"ERROR: {error_msg}")
-                return
-            
-            # Leemos el archivo CSV usando pandas
+            elif not file_path.suffix.lower() == '.csv':
+                result.error = f"El archivo '{filename}' no es un archivo CSV válido"
+            elif report_format not in REPORT_FORMATS:
+                result.error = f"Formato de reporte desconocido: {report_format} (opciones: {', '.join(REPORT_FORMATS)})"
+            else:
+                # Calculamos las estadísticas en memoria o por bloques
+                analysis = self._csv_analysis(file_path, summary, chunksize, cache, approximate, stages)
+                result = CsvResult(file=filename, **analysis)
+                
+                # Guardamos el reporte si se especifica una ruta (el de texto
+                # solo si hay columnas numéricas)
+                if report_path and (report_format != "txt" or result.numeric):
+                    with stages('report'):
+                        report_file = self._write_csv_report(analysis, filename, Path(report_path), report_format)
+                    result.report_file = str(report_file)
+                        
+        except Exception as e:
+            result = CsvResult(file=filename, error=f"Error al leer archivo CSV: {str(e)}")
+        
+        result.metrics = stages.as_dict()
+        stages.close()
+        self._record_metrics(filename, result.metrics)
+        return self._finish(result)
+    
+    def _csv_analysis(self, file_path: Path, summary: bool, chunksize: Optional[int], cache: Optional[str],
+                      approximate: bool, stages=NULL_TIMER) -> dict:
+        """
+        Estadísticas de read_csv y process_folder: en memoria, por bloques o
+        aproximadas según las opciones, pasando por result_cache.
+        
+        Returns:
+            dict: Columnas, filas y estadísticas numéricas y no numéricas
+        """
+        def analyze():
+            if chunksize or approximate:
+                return self._analyze_csv_chunks(file_path, chunksize or APPROXIMATE_CHUNKSIZE,
+                                                summary, cache, stages, approximate)
+            return self._analyze_csv(file_path, summary, cache, stages)
+        
+        # La caché columnar no cambia el resultado: no forma parte de la clave
+        params = {'summary': summary, 'chunksize': chunksize, 'approximate': approximate}
+        return self._cached_analysis('csv', file_path, params, analyze, stages)
+    
+    def _analyze_csv(self, file_path: Path, summary: bool, cache: Optional[str] = None,
+                     stages=NULL_TIMER) -> dict:
+        """
+        Calcula las estadísticas de un CSV cargándolo completo en memoria.
+        
+        Args:
+            file_path (Path): Ruta del archivo CSV
+            summary (bool): Si True, resume también las columnas no numéricas
+            cache (str, optional): Formato de la caché columnar ('parquet' o 'feather')
+            stages (StageTimer, optional): Medidor de las etapas 'parse' y 'stats'
+        
+        Returns:
+            dict: Columnas, filas y estadísticas numéricas y no numéricas
+        """
+        if cache:
+            sidecar, columns, needed = self._csv_sidecar(file_path, cache, summary, stages=stages)
+            with stages('parse'):
+                df = columnar_cache.read_columns(sidecar, cache, needed)
+            with stages('stats'):
+                analysis = self._analyze_dataframe(df, summary)
+            analysis['columns'] = columns
+            analysis['rows'] = columnar_cache.row_count(sidecar, cache)
+            return analysis
+        
+        # Leemos el archivo CSV usando pandas
+        with stages('parse'):
             df = pd.read_csv(file_path)
+        
+        with stages('stats'):
+            return self._analyze_dataframe(df, summary)
+    
+    def _csv_sidecar(self, file_path: Path, cache: str, summary: bool, chunksize: Optional[int] = None,
+                     stages=NULL_TIMER) -> Tuple[Path, List[str], List[str]]:
+        """
+        Devuelve la caché columnar de un CSV, creándola si no existe o si el CSV
+        cambió desde que se creó.
+        
+        Args:
+            file_path (Path): Ruta del archivo CSV
+            cache (str): Formato de la caché ('parquet' o 'feather')
+            summary (bool): Si True, se necesitan también las columnas no numéricas
+            chunksize (int, optional): Si se indica, la caché se crea por bloques
+                de este número de filas en lugar de cargar el CSV completo
+            stages (StageTimer, optional): Medidor de la etapa 'convert'
+        
+        Returns:
+            tuple: (ruta de la caché, todas las columnas, columnas a leer)
+        """
+        columnar_cache.require_pyarrow()
+        sidecar = columnar_cache.sidecar_path(file_path, cache)
+        
+        schema = columnar_cache.cached_schema(file_path, cache)
+        if schema is None:
+            with stages('convert'):
+                schema = columnar_cache.convert_csv(file_path, cache, chunksize)
+            self.logger.info(f"Caché columnar creada: {sidecar}")
+        
+        columns = list(schema.names)
+        needed = columns if summary else columnar_cache.numeric_columns(schema)
+        return sidecar, columns, needed
+    
+    def _analyze_dataframe(self, df: pd.DataFrame, summary: bool) -> dict:
+        """
+        Calcula las estadísticas de un DataFrame.
+        
+        Las columnas numéricas se procesan juntas en una sola pasada
+        vectorizada sobre su array 2-D, y cada columna no numérica con una
+        sola pasada de la que salen los valores únicos y los más frecuentes.
+        
+        Args:
+            df (pd.DataFrame): Datos a analizar
+            summary (bool): Si True, resume también las columnas no numéricas
+        
+        Returns:
+            dict: Columnas, filas y estadísticas numéricas y no numéricas
+        """
+        analysis = {
+            'columns': list(df.columns),
+            'rows': len(df),
+            'numeric': {},
+            'non_numeric': {},
+        }
+        
+        # Analizamos columnas numéricas en una sola pasada sobre el bloque 2-D
+        numeric_cols = list(df.select_dtypes(include=[np.number]).columns)
+        if numeric_cols:
+            moments = RunningMoments(numeric_cols)
+            moments.update(df[numeric_cols].to_numpy(dtype=float))
+            for col, avg, std in zip(numeric_cols, moments.means(), moments.stds()):
+                analysis['numeric'][col] = {'average': avg, 'std_dev': std}
+        
+        # Analizamos columnas no numéricas si se solicita
+        if summary:
+            non_numeric_cols = df.select_dtypes(exclude=[np.number]).columns
+            for col in non_numeric_cols:
+                # Una sola pasada da los valores únicos y los más frecuentes
+                unique, top = value_frequencies(df[col], 5)
+                analysis['non_numeric'][col] = {
+                    'unique': unique,
+                    'unique_exceeded': False,
+                    'top': top,
+                    'approximate': False,
+                    'error_bound': 0,
+                }
+        
+        return analysis
+    
+    def _analyze_csv_chunks(self, file_path: Path, chunksize: int, summary: bool,
+                            cache: Optional[str] = None, stages=NULL_TIMER,
+                            approximate: bool = False) -> dict:
+        """
+        Calcula las estadísticas de un CSV leyéndolo por bloques, con memoria
+        acotada independientemente del tamaño del archivo.
+        
+        La media y la desviación estándar se combinan bloque a bloque con un
+        algoritmo estable (RunningMoments) y dan el mismo resultado que la
+        lectura completa. Las columnas numéricas se fijan con el primer bloque.
+        
+        Args:
+            file_path (Path): Ruta del archivo CSV
+            chunksize (int): Número de filas por bloque
+            summary (bool): Si True, resume también las columnas no numéricas
+            cache (str, optional): Formato de la caché columnar ('parquet' o 'feather')
+            stages (StageTimer, optional): Medidor de las etapas 'parse' y 'stats'
+            approximate (bool): Si True, estima las estadísticas (ver _analyze_chunks)
+        
+        Returns:
+            dict: Columnas, filas y estadísticas numéricas y no numéricas
+        """
+        if cache:
+            sidecar, columns, needed = self._csv_sidecar(file_path, cache, summary, chunksize, stages)
+            chunks = columnar_cache.iter_columns(sidecar, cache, needed, chunksize)
+            analysis = self._analyze_chunks(chunks, summary, stages, approximate)
+            analysis['columns'] = columns
+            analysis['rows'] = columnar_cache.row_count(sidecar, cache)
+            return analysis
+        
+        return self._analyze_chunks(pd.read_csv(file_path, chunksize=chunksize), summary, stages, approximate)
+    
+    def _analyze_chunks(self, chunks, summary: bool, stages=NULL_TIMER, approximate: bool = False) -> dict:
+        """
+        Combina las estadísticas de una secuencia de bloques de filas.
+        
+        Args:
+            chunks (iterable): Bloques (pd.DataFrame) con las mismas columnas
+            summary (bool): Si True, resume también las columnas no numéricas
+            stages (StageTimer, optional): Medidor de las etapas 'parse' (lectura
+                de cada bloque) y 'stats', acumuladas sobre todos los bloques
+            approximate (bool): Si True, las columnas numéricas se estiman con una
+                muestra de reservorio (con 'average_margin', 'std_dev_margin' y
+                'sample_size') y las no numéricas con sketches (con 'unique_error')
+        
+        Returns:
+            dict: Columnas, filas y estadísticas numéricas y no numéricas
+        """
+        columns = []
+        numeric_cols = []
+        non_numeric_cols = []
+        moments = None
+        frequencies = {}
+        rows = 0
+        
+        chunks = iter(chunks)
+        while True:
+            # La lectura de cada bloque se mide aparte de su análisis
+            with stages('parse'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
             
-            print(f"\nAnálisis CSV: {filename}")
-            print(f"Columnas: {list(df.columns)}")
-            print(f"Filas: {len(df)}")
-            
-            # Analizamos columnas numéricas
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            if len(numeric_cols) > 0:
-                print("Columnas Numéricas:")
-                analysis_data = {}
+            with stages('stats'):
+                if moments is None:
+                    columns = list(chunk.columns)
+                    numeric_cols = list(chunk.select_dtypes(include=[np.number]).columns)
+                    non_numeric_cols = [col for col in columns if col not in numeric_cols]
+                    moments = ReservoirSample(numeric_cols) if approximate else RunningMoments(numeric_cols)
+                    if summary:
+                        summary_type = SketchSummary if approximate else FrequencySummary
+                        frequencies = {col: summary_type() for col in non_numeric_cols}
+                
+                rows += len(chunk)
+                
+                # Los valores no numéricos de bloques posteriores se tratan como NaN
+                if numeric_cols:
+                    block = chunk[numeric_cols].apply(pd.to_numeric, errors='coerce')
+                    moments.update(block.to_numpy(dtype=float))
+                
+                for col, frequency in frequencies.items():
+                    frequency.update(chunk[col])
+        
+        analysis = {
+            'columns': columns,
+            'rows': rows,
+            'numeric': {},
+            'non_numeric': {},
+        }
+        
+        if approximate and moments is not None:
+            for col, estimate in zip(numeric_cols, moments.estimates()):
+                analysis['numeric'][col] = estimate
+        elif moments is not None:
+            for col, avg, std in zip(numeric_cols, moments.means(), moments.stds()):
+                analysis['numeric'][col] = {'average': avg, 'std_dev': std}
+        
+        for col, frequency in frequencies.items():
+            analysis['non_numeric'][col] = {
+                'unique': frequency.distinct,
+                'unique_exceeded': frequency.distinct_exceeded,
+                'top': frequency.top(5),
+                'approximate': not frequency.exact,
+                'error_bound': frequency.error_bound,
+            }
+            if approximate:
+                analysis['non_numeric'][col]['unique_error'] = frequency.distinct_error
+        
+        return analysis
+    
+    def _write_csv_report(self, analysis: dict, filename: str, report_dir: Path, report_format: str) -> Path:
+        """
+        Guarda las estadísticas de read_csv en texto, JSON o Parquet.
+        
+        Args:
+            analysis (dict): Resultado del análisis
+            filename (str): Nombre del CSV analizado
+            report_dir (Path): Carpeta del reporte
+            report_format (str): 'txt', 'json' o 'parquet'
+        
+        Returns:
+            Path: Ruta del reporte guardado
+        """
+        report_dir.mkdir(parents=True, exist_ok=True)
+        
+        if report_format == "txt":
+            report_file = report_dir / f"{filename}_analysis.txt"
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write(f"Análisis de {filename}\n")
+                f.write("=" * 50 + "\n")
+                f.write(f"Filas: {analysis['rows']}\n")
+                f.write(f"Columnas: {len(analysis['columns'])}\n\n")
+                f.write("Análisis de Columnas Numéricas:\n")
+                for col, data in analysis['numeric'].items():
+                    if 'average_margin' in data:
+                        f.write(f"{col}: Promedio = {data['average']:.2f} ± {data['average_margin']:.2f}, "
+                                f"Desviación Estándar = {data['std_dev']:.2f} ± {data['std_dev_margin']:.2f} "
+                                f"(aprox., 95 %, muestra de {data['sample_size']})\n")
+                    else:
+                        f.write(f"{col}: Promedio = {data['average']:.2f}, Desviación Estándar = {data['std_dev']:.2f}\n")
                 
-                for col in numeric_cols:
-                    avg = df[col].mean()
-                    std = df[col].std()
-                    print(f" - {col}: Promedio = {avg:.2f}, Desviación Estándar = {std:.2f}")
-                    analysis_data[col] = {'average': avg, 'std_dev': std}
+                # Resúmenes aproximados de las columnas no numéricas
+                approximate = {col: data for col, data in analysis['non_numeric'].items() if 'unique_error' in data}
+                if approximate:
+                    f.write("\nResumen de Columnas No Numéricas:\n")
+                for col, data in approximate.items():
+                    f.write(f"{col}: Valores únicos ≈ {data['unique']} (± {data['unique_error']:.1%}), "
+                            f"Frecuencias (error máximo {data['error_bound']}) = {data['top']}\n")
+            return report_file
+        
+        report_file = report_dir / f"{Path(filename).name}_analysis.{report_format}"
+        if report_format == "parquet":
+            table = columnar_cache.stats_table(analysis, filename)
+            columnar_cache.pq.write_table(table, report_file)
+        else:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(self._to_json({'file': filename, **analysis}), f, ensure_ascii=False, indent=2)
+        
+        return report_file
+    
+    def read_dicom(self, filename: str, tags: Optional[List[Tuple[int, int]]] = None,
+                   extract_image: bool = False, image_format: str = "png",
+                   compression: Optional[int] = None) -> DicomResult:
+        """
+        Lee y analiza un archivo DICOM.
+        
+        Args:
+            filename (str): Nombre del archivo DICOM
+            tags (List[Tuple[int, int]], optional): Lista de tags DICOM a extraer
+            extract_image (bool): Si True, extrae y guarda la imagen (el primer frame)
+            image_format (str): Formato de la imagen: 'png' (8 bits, por defecto),
+                'png16', 'tiff', 'npy' (profundidad original) o 'webp' (8 bits,
+                sin pérdidas); ver dicom_image.save_image
+            compression (int, optional): Nivel de compresión de 0 a 9; None usa
+                el de Pillow, sin compresión en TIFF (ver dicom_image.save_image;
+                los niveles bajos codifican mucho más rápido)
+        
+        Returns:
+            DicomResult: Metadatos, tags y ruta de la imagen; si hubo un error,
+            solo el mensaje en error (y el resultado es falso)
+        """
+        result = DicomResult(file=filename, requested_tags=list(tags or []), extract_image=extract_image)
+        stages = self._stage_timer()
+        try:
+            # Construimos la ruta completa del archivo
+            file_path = self.base_path / filename
+            
+            # Verificamos si el archivo existe
+            if not file_path.exists():
+                result.error = f"El archivo '{file_path}' no existe"
+            elif extract_image and image_format not in IMAGE_FORMATS:
+                result.error = f"Formato de imagen desconocido: {image_format} (opciones: {', '.join(IMAGE_FORMATS)})"
+            else:
+                analysis = self._dicom_analysis(filename, tags, extract_image, stages, image_format, compression)
+                result = DicomResult(file=filename, requested_tags=list(tags or []),
+                                     extract_image=extract_image, **analysis)
                 
-                # Guardamos el reporte si se especifica una ruta
-                if report_path:
-                    report_dir = Path(report_path)
-                    report_dir.mkdir(parents=True, exist_ok=True)
+                # El error de imagen no invalida los metadatos: solo se registra
+                if result.image_error:
+                    self.logger.error(f"Error al extraer imagen: {result.image_error}")
+                    
+        except Exception as e:
+            result = DicomResult(file=filename, error=f"Error al leer archivo DICOM: {str(e)}")
+        
+        result.metrics = stages.as_dict()
+        stages.close()
+        self._record_metrics(filename, result.metrics)
+        return self._finish(result)
+    
+    def _dicom_analysis(self, filename: str, tags: Optional[List[Tuple[int, int]]], extract_image: bool,
+                        stages=NULL_TIMER, image_format: str = "png", compression: Optional[int] = None) -> dict:
+        """
+        _analyze_dicom pasando por result_cache; la imagen extraída se guarda
+        en la caché y se restaura junto al archivo.
+        
+        Returns:
+            dict: Análisis de _analyze_dicom
+        """
+        params = {'tags': list(tags or []), 'extract_image': extract_image}
+        image_target = None
+        if extract_image:
+            params.update(image_format=image_format, compression=compression)
+            image_target = self.base_path / f"{filename.rsplit('.', 1)[0]}{IMAGE_FORMATS[image_format]}"
+        
+        return self._cached_analysis(
+            'dicom', self.base_path / filename, params,
+            lambda: self._analyze_dicom(filename, tags, extract_image, stages, image_format, compression),
+            stages, image_target,
+        )
+    
+    def _analyze_dicom(self, filename: str, tags: Optional[List[Tuple[int, int]]],
+                       extract_image: bool, stages=NULL_TIMER, image_format: str = "png",
+                       compression: Optional[int] = None) -> dict:
+        """
+        Lee un archivo DICOM y extrae sus datos sin mostrarlos.
+        
+        Args:
+            filename (str): Nombre del archivo DICOM, relativo a base_path
+            tags (List[Tuple[int, int]], optional): Lista de tags DICOM a extraer
+            extract_image (bool): Si True, extrae y guarda la imagen
+            stages (StageTimer, optional): Medidor de las etapas 'dcmread',
+                'tags', 'decode', 'normalize' y 'encode'
+            image_format (str): Formato de la imagen (ver read_dicom)
+            compression (int, optional): Nivel de compresión (ver read_dicom)
+        
+        Returns:
+            dict: Datos del paciente y del estudio, tags encontrados ('tags'),
+            errores al leer tags ('tag_errors'), ruta de la imagen extraída
+            ('image_path') y error de extracción ('image_error')
+        """
+        file_path = self.base_path / filename
+        
+        # Leemos el archivo DICOM (solo la cabecera si no se necesita la imagen)
+        with stages('dcmread'):
+            ds = self._read_dicom_dataset(file_path, tags, extract_image)
+        
+        with stages('tags'):
+            analysis = self._dicom_header(ds, tags)
+        
+        # Extraemos la imagen si se solicita
+        if extract_image:
+            try:
+                # Verificamos si el archivo tiene datos de imagen
+                if any(tag in ds for tag, _ in PIXEL_DATA_ELEMENTS):
+                    # Solo leemos el primer frame: del archivo proyectado en
+                    # memoria (sintaxis nativa) o decodificando solo ese frame
+                    with stages('decode'):
+                        pixel_array = self._first_frame(file_path, ds)
                     
-                    report_file = report_dir / f"{filename}_analysis.txt"
-                    with open(report_file, 'w', encoding='utf-8') as f:
-                        f.write(f"Análisis de {filename}\n")
-                        f.write("=" * 50 + "\n")
-                        f.write(f"Filas: {len(df)}\n")
-                        f.write(f"Columnas: {len(df.columns)}\n\n")
-                        f.write("Análisis de Columnas Numéricas:\n")
-                        for col, data in analysis_data.items():
-                            f.write(f"{col}: Promedio = {data['average']:.2f}, Desviación Estándar = {data['std_dev']:.2f}\n")
+                    if len(pixel_array.shape) > 2:
+                        # Si tiene canales de color, tomamos el primero
+                        pixel_array = pixel_array[:, :, 0]
                     
-                    print(f"Reporte guardado en: {report_file}")
-            
-            # Mostramos resumen de columnas no numéricas si se solicita
-            if summary:
-                non_numeric_cols = df.select_dtypes(exclude=[np.number]).columns
-                if len(non_numeric_cols) > 0:
-                    print("Resumen de Columnas No Numéricas:")
-                    for col in non_numeric_cols:
-                        unique_values = df[col].nunique()
-                        value_counts = df[col].value_counts()
-                        print(f" - {col}: Valores únicos = {unique_values}")
-                        print(f"   Frecuencias: {dict(value_counts.head(5))}")  # Mostramos los 5 más frecuentes
-                        
+                    # En los formatos de 8 bits normalizamos la imagen (min/max
+                    # a 0-255) con una tabla uint8, sin copias en coma flotante
+                    with stages('normalize'):
+                        if image_format in WINDOWED_FORMATS and pixel_array.dtype != np.uint8:
+                            pixel_array = frame_to_uint8(pixel_array)
+                    
+                    # Guardamos la imagen
+                    with stages('encode'):
+                        image_path = self.base_path / f"{filename.rsplit('.', 1)[0]}{IMAGE_FORMATS[image_format]}"
+                        save_image(pixel_array, image_path, image_format, compression)
+                    analysis['image_path'] = str(image_path)
+                    
+            except Exception as e:
+                analysis['image_error'] = str(e)
+        
+        return analysis
+    
+    @staticmethod
+    def _first_frame(file_path: Path, ds: pydicom.Dataset) -> np.ndarray:
+        """
+        Píxeles del primer frame de un archivo DICOM sin decodificar los demás.
+        
+        Args:
+            file_path (Path): Ruta del archivo DICOM
+            ds (pydicom.Dataset): Dataset del archivo con Pixel Data sin acceder
+        
+        Returns:
+            np.ndarray: Frame como lo devuelve pixel_array
+        """
+        mapped = memmap_pixels(file_path, ds)
+        if mapped is not None:
+            return stored_values(mapped[0] if frame_count(ds) > 1 else mapped, ds)
+        return next(iter_pixels(file_path, indices=[0]))
+    
+    def _dicom_header(self, ds: pydicom.Dataset, tags: Optional[List[Tuple[int, int]]]) -> dict:
+        """
+        Datos del paciente y del estudio y tags pedidos de un dataset.
+        
+        Args:
+            ds (pydicom.Dataset): Dataset DICOM
+            tags (List[Tuple[int, int]], optional): Lista de tags DICOM a extraer
+        
+        Returns:
+            dict: Resultado de _analyze_dicom sin imagen
+        """
+        analysis = {
+            'patient_name': self._dicom_attribute(ds, 'PatientName'),
+            'study_date': self._dicom_attribute(ds, 'StudyDate'),
+            'modality': self._dicom_attribute(ds, 'Modality'),
+            'tags': {},
+            'tag_errors': {},
+            'image_path': None,
+            'image_error': None,
+        }
+        
+        # Extraemos los tags específicos; los que no existen no se añaden
+        for tag in tags or []:
+            try:
+                analysis['tags'][tag] = ds[tag].value
+            except KeyError:
+                pass
+            except Exception as e:
+                analysis['tag_errors'][tag] = str(e)
+        
+        return analysis
+    
+    def export_frames(self, filename: str, frames=None, window: Optional[Tuple[float, float]] = None,
+                      output_dir: Optional[str] = None, workers: Optional[int] = None,
+                      image_format: str = "png", compression: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Exporta como imágenes todos los frames (o una selección) de un archivo DICOM.
+        
+        Solo se decodifican los frames pedidos. En PNG y WebP cada frame se
+        convierte a 8 bits aplicando Rescale Slope/Intercept y la ventana
+        (Window Center/Width) mediante una tabla uint8; 'png16', 'tiff' y 'npy'
+        guardan los valores almacenados sin pérdida. Los frames se codifican
+        en paralelo.
+        
+        Args:
+            filename (str): Nombre del archivo DICOM
+            frames: None (todos), un índice, un range, un slice o una lista de índices
+            window (tuple, optional): (center, width) en unidades de modalidad; por
+                defecto la ventana del archivo o, si no tiene, el min/max de cada frame
+            output_dir (str, optional): Carpeta de salida; por defecto
+                '<nombre>_frames' junto al archivo
+            workers (int, optional): Hilos de codificación; None usa todos los núcleos
+            image_format (str): 'png', 'png16', 'tiff', 'webp' o 'npy' (ver read_dicom)
+            compression (int, optional): Nivel de compresión de 0 a 9 (ver read_dicom)
+        
+        Returns:
+            List[str]: Rutas de las imágenes en el orden de los frames, o None si hubo un error
+        """
+        try:
+            file_path = self.base_path / filename
+            
+            # Verificamos si el archivo existe
+            if not file_path.exists():
+                self._fail(f"El archivo '{file_path}' no existe")
+                return None
+            
+            suffix = check_image_format(image_format)
+            
+            # La cabecera basta para conocer los frames y la transformación
+            ds = pydicom.dcmread(file_path, stop_before_pixels=True)
+            indices = select_frames(frame_count(ds), frames)
+            
+            stem = Path(filename).stem
+            out_dir = Path(output_dir) if output_dir else file_path.parent / f"{stem}_frames"
+            out_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Sintaxis nativa: cada hilo lee su frame del archivo proyectado;
+            # comprimida: se decodifican solo los frames pedidos
+            mapped = memmap_pixels(file_path)
+            if mapped is not None:
+                if frame_count(ds) == 1:
+                    mapped = mapped[np.newaxis]
+                frames_source = (mapped[index] for index in indices)
+            else:
+                frames_source = iter_pixels(file_path, indices=indices)
+            
+            jobs = (
+                (pixels, out_dir / f"{stem}_{index:04d}{suffix}")
+                for index, pixels in zip(indices, frames_source)
+            )
+            paths = self._write_frames(jobs, ds, window, workers, image_format, compression)
+            
+            self._show(f"\nFrames exportados de {filename}: {len(paths)} en {out_dir}")
+            return paths
+            
         except Exception as e:
-            error_msg = f"Error al leer archivo CSV: {str(e)}"
-            self.logger.error(error_msg)
-            print(f"ERROR: {error_msg}")
+            self._fail(f"Error al exportar frames DICOM: {str(e)}")
+            return None
     
-    def read_dicom(self, filename: str, tags: Optional[List[Tuple[int, int]]] = None, extract_image: bool = False) -> None:
+    def read_pixels(self, filename: str, mmap: bool = True) -> Optional[np.ndarray]:
         """
-        Lee y analiza un archivo DICOM.
+        Devuelve los píxeles de un archivo DICOM sin cargarlo entero cuando es posible.
+        
+        Con sintaxis de transferencia nativa (sin comprimir) devuelve un np.memmap
+        de solo lectura sobre el elemento Pixel Data: recortar, submuestrear o
+        calcular estadísticas solo lee del disco la parte usada. Son las palabras
+        almacenadas; dicom_image.stored_values(region, ds) aplica Bits Stored a
+        una región como lo hace pixel_array. Con sintaxis comprimida (o mmap=False)
+        decodifica el archivo completo.
         
         Args:
             filename (str): Nombre del archivo DICOM
-            tags (List[Tuple[int, int]], optional): Lista de tags DICOM a extraer
-            extract_image (bool): Si True, extrae y guarda la imagen como PNG
+            mmap (bool): Si False, siempre decodifica con pixel_array
+        
+        Returns:
+            np.ndarray: Píxeles con la forma de pixel_array, o None si hubo un error
         """
         try:
+            file_path = self.base_path / filename
             
-            # Construimos la ruta completa del archivo
+            # Verificamos si el archivo existe
+            if not file_path.exists():
+                self._fail(f"El archivo '{file_path}' no existe")
+                return None
+            
+            pixels = memmap_pixels(file_path) if mmap else None
+            if pixels is not None:
+                self.logger.info(f"Píxeles proyectados en memoria: {filename}")
+                return pixels
+            
+            self.logger.info(f"Píxeles decodificados: {filename}")
+            return pixel_array(file_path)
+            
+        except Exception as e:
+            self._fail(f"Error al leer píxeles DICOM: {str(e)}")
+            return None
+    
+    def dicom_pixel_stats(self, filename: str, frames=None, percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                          bins: int = 256, hist_range: Optional[Tuple[float, float]] = None, rescale: bool = True,
+                          tile_rows: Optional[int] = None) -> PixelStatsResult:
+        """
+        Calcula estadísticas de intensidad por frame de un archivo DICOM sin
+        exportar imágenes: mínimo, máximo, media, desviación estándar,
+        percentiles e histograma.
+        
+        Cada frame se recorre una sola vez contando sus valores
+        (dicom_image.pixel_value_counts) y todas las estadísticas salen de esos
+        conteos. Con sintaxis nativa los frames se leen del archivo proyectado
+        en memoria; con tile_rows, por bloques de filas. Para varios archivos
+        en paralelo, ver process_folder(pixel_stats=True).
+        
+        Args:
+            filename (str): Nombre del archivo DICOM
+            frames: None (todos), un índice, un range, un slice o una lista de índices
+            percentiles (Sequence[float]): Percentiles a calcular (0 a 100)
+            bins (int): Número de intervalos del histograma
+            hist_range (tuple, optional): (mínimo, máximo) del histograma; por
+                defecto el rango de cada frame
+            rescale (bool): Si True, en unidades de modalidad (Rescale
+                Slope/Intercept aplicados); si False, valores almacenados
+            tile_rows (int, optional): Filas por bloque para acotar la memoria
+        
+        Returns:
+            PixelStatsResult: Transformación aplicada y estadísticas de cada
+            frame; si hubo un error, solo el mensaje en error (y el resultado
+            es falso)
+        """
+        result = PixelStatsResult(file=filename)
+        stages = self._stage_timer()
+        try:
             file_path = self.base_path / filename
             
             # Verificamos si el archivo existe
             if not file_path.exists():
-                error_msg = f"El archivo '{file_path}' no existe"
-                self.logger.error(error_msg)
-                print(f"ERROR: {error_msg}")
-                return
+                result.error = f"El archivo '{file_path}' no existe"
+            else:
+                stats = self._pixel_stats(file_path, frames, percentiles, bins, hist_range, rescale, tile_rows,
+                                          stages)
+                result = PixelStatsResult(file=filename, **stats)
+            
+        except Exception as e:
+            result = PixelStatsResult(file=filename, error=f"Error al calcular estadísticas de píxeles DICOM: {str(e)}")
+        
+        result.metrics = stages.as_dict()
+        stages.close()
+        self._record_metrics(filename, result.metrics)
+        return self._finish(result)
+    
+    def _pixel_stats(self, file_path: Path, frames=None, percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                     bins: int = 256, hist_range: Optional[Tuple[float, float]] = None, rescale: bool = True,
+                     tile_rows: Optional[int] = None, stages=NULL_TIMER) -> dict:
+        """
+        Estadísticas por frame de dicom_pixel_stats (lanza excepciones).
+        
+        Args:
+            file_path (Path): Ruta del archivo DICOM
+            frames, percentiles, bins, hist_range, rescale, tile_rows: Ver dicom_pixel_stats
+            stages (StageTimer, optional): Medidor de las etapas 'dcmread' y 'pixel_stats'
+        
+        Returns:
+            dict: 'frames' (estadísticas de cada frame con su índice en 'frame'),
+            'slope' e 'intercept' aplicados
+        """
+        # Cabecera completa con los píxeles diferidos (no se leen aquí)
+        with stages('dcmread'):
+            ds = pydicom.dcmread(file_path, defer_size=DICOM_DEFER_SIZE)
+        if not any(tag in ds for tag, _ in PIXEL_DATA_ELEMENTS):
+            raise ValueError("El archivo DICOM no contiene datos de imagen")
+        
+        indices = select_frames(frame_count(ds), frames)
+        slope, intercept = rescale_parameters(ds) if rescale else (1.0, 0.0)
+        
+        # Sintaxis nativa: se cuentan los valores directamente del archivo
+        # proyectado (con Bits Stored aplicado por bloque); comprimida: se
+        # decodifican solo los frames pedidos
+        mapped = memmap_pixels(file_path, ds)
+        if mapped is not None:
+            if frame_count(ds) == 1:
+                mapped = mapped[np.newaxis]
+            frames_source = ((mapped[index], ds) for index in indices)
+        else:
+            frames_source = ((pixels, None) for pixels in iter_pixels(file_path, indices=indices))
+        
+        results = []
+        with stages('pixel_stats'):
+            for index, (pixels, frame_ds) in zip(indices, frames_source):
+                values, counts = pixel_value_counts(pixels, frame_ds, tile_rows)
+                results.append({'frame': index, **pixel_statistics(values, counts, slope, intercept,
+                                                                   percentiles, bins, hist_range)})
+        
+        return {'slope': slope, 'intercept': intercept, 'frames': results}
+    
+    def export_series(self, folder_name: str, pattern: str = "*.dcm", window: Optional[Tuple[float, float]] = None,
+                      output_dir: Optional[str] = None, workers: Optional[int] = None,
+                      image_format: str = "png", compression: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Exporta como imágenes los cortes de una serie (un archivo DICOM por corte),
+        ordenados por su posición en el volumen.
+        
+        Args:
+            folder_name (str): Carpeta de la serie, relativa a base_path
+            pattern (str): Patrón de nombre de los archivos de la serie
+            window (tuple, optional): (center, width); por defecto la ventana del
+                primer corte o, si no tiene, el min/max de toda la serie (una
+                pasada previa por los cortes), compartida por toda la serie
+            output_dir (str, optional): Carpeta de salida; por defecto
+                '<carpeta>_frames' junto a la carpeta de la serie
+            workers (int, optional): Hilos de decodificación y codificación
+            image_format (str): Formato de las imágenes (ver export_frames)
+            compression (int, optional): Nivel de compresión de 0 a 9 (ver read_dicom)
+        
+        Returns:
+            List[str]: Rutas de las imágenes en el orden de la serie, o None si hubo un error
+        """
+        try:
+            suffix = check_image_format(image_format)
+            series = self._dicom_series(folder_name, pattern)
+            if not series:
+                self._fail(f"No hay archivos DICOM '{pattern}' en '{folder_name}'")
+                return None
             
-            # Leemos el archivo DICOM
-            ds = pydicom.dcmread(file_path)
+            folder_path = self.base_path / folder_name
+            stem = folder_path.resolve().name
+            out_dir = Path(output_dir) if output_dir else folder_path.parent / f"{stem}_frames"
+            out_dir.mkdir(parents=True, exist_ok=True)
             
-            print(f"\nAnálisis DICOM: {filename}")
+            first = series[0][1]
+            window = window or window_parameters(first)
+            if window is None and image_format in WINDOWED_FORMATS:
+                # Sin ventana, un min/max común evita saltos de brillo entre cortes
+                window = self._series_window(series, workers)
             
-            # Mostramos información básica del paciente
-            try:
-                patient_name = ds.PatientName if hasattr(ds, 'PatientName') else "No disponible"
-                print(f"Nombre del Paciente: {patient_name}")
-            except:
-                print("Nombre del Paciente: No disponible")
+            # Cada corte se decodifica en el hilo que lo codifica
+            jobs = (
+                (path, out_dir / f"{stem}_{index:04d}{suffix}", ds)
+                for index, (path, ds) in enumerate(series)
+            )
+            paths = self._write_frames(jobs, first, window, workers, image_format, compression)
             
-            try:
-                study_date = ds.StudyDate if hasattr(ds, 'StudyDate') else "No disponible"
-                print(f"Fecha del Estudio: {study_date}")
-            except:
-                print("Fecha del Estudio: No disponible")
+            self._show(f"\nSerie exportada de {folder_name}: {len(paths)} cortes en {out_dir}")
+            return paths
             
-            try:
-                modality = ds.Modality if hasattr(ds, 'Modality') else "No disponible"
-                print(f"Modalidad: {modality}")
-            except:
-                print("Modalidad: No disponible")
-            
-            # Mostramos tags específicos si se proporcionan
-            if tags:
-                print("Tags específicos:")
-                for tag in tags:
-                    try:
-                        tag_value = ds[tag].value
-                        print(f"Tag {hex(tag[0])}, {hex(tag[1])}: {tag_value}")
-                    except KeyError:
-                        print(f"Tag {hex(tag[0])}, {hex(tag[1])}: No encontrado")
-                    except Exception as e:
-                        print(f"Tag {hex(tag[0])}, {hex(tag[1])}: Error al leer - {str(e)}")
-            
-            # Extraemos la imagen si se solicita
-            if extract_image:
-                try:
-                    # Verificamos si el archivo tiene datos de imagen
-                    if hasattr(ds, 'pixel_array'):
-                        pixel_array = ds.pixel_array
-                        
-                        # Manejamos diferentes tipos de arrays de píxeles
-                        if len(pixel_array.shape) > 2:
-                            # Si es un array 3D, tomamos el primer slice
-                            pixel_array = pixel_array[0] if pixel_array.shape[0] == 1 else pixel_array[:, :, 0]
-                        
-                        # Normalizamos la imagen para guardar como PNG
-                        if pixel_array.dtype != np.uint8:
-                            # Convertimos a rango 0-255
-                            pixel_array = ((pixel_array - pixel_array.min()) / 
-                                         (pixel_array.max() - pixel_array.min()) * 255).astype(np.uint8)
-                        
-                        # Creamos la imagen
-                        image = Image.fromarray(pixel_array)
-                        
-                        # Guardamos la imagen
-                        image_path = self.base_path / f"{filename.rsplit('.', 1)[0]}.png"
-                        image.save(image_path)
-                        print(f"Imagen extraída y guardada en: {image_path}")
-                    else:
-                        print("El archivo DICOM no contiene datos de imagen")
-                        
-                except Exception as e:
-                    error_msg = f"Error al extraer imagen: {str(e)}"
-                    self.logger.error(error_msg)
-                    print(f"ERROR: {error_msg}")
-                    
         except Exception as e:
-            error_msg = f"Error al leer archivo DICOM: {str(e)}"
-            self.logger.error(error_msg)
-            print(f"ERROR: {error_msg}")
+            self._fail(f"Error al exportar serie DICOM: {str(e)}")
+            return None
+    
+    def load_series(self, folder_name: str, pattern: str = "*.dcm", rescale: bool = True) -> Optional[np.ndarray]:
+        """
+        Apila los cortes de una serie en un volumen (cortes x filas x columnas),
+        ordenados por su posición.
+        
+        El volumen se reserva una sola vez y cada corte se copia directamente
+        en su posición.
+        
+        Args:
+            folder_name (str): Carpeta de la serie, relativa a base_path
+            pattern (str): Patrón de nombre de los archivos de la serie
+            rescale (bool): Si True, el volumen es float32 en unidades de modalidad
+                (Rescale Slope/Intercept aplicados); si False, valores almacenados
+        
+        Returns:
+            np.ndarray: Volumen de la serie, o None si hubo un error
+        """
+        try:
+            series = self._dicom_series(folder_name, pattern)
+            if not series:
+                self._fail(f"No hay archivos DICOM '{pattern}' en '{folder_name}'")
+                return None
+            
+            volume = None
+            for index, (path, ds) in enumerate(series):
+                pixels = pixel_array(path)
+                if volume is None:
+                    dtype = np.float32 if rescale else pixels.dtype
+                    volume = np.empty((len(series),) + pixels.shape, dtype=dtype)
+                
+                volume[index] = pixels
+                if rescale:
+                    slope, intercept = rescale_parameters(ds)
+                    if slope != 1:
+                        volume[index] *= slope
+                    if intercept:
+                        volume[index] += intercept
+            
+            return volume
+            
+        except Exception as e:
+            self._fail(f"Error al cargar serie DICOM: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _series_window(series: List[Tuple[Path, pydicom.Dataset]], workers: Optional[int]) -> Tuple[float, float]:
+        """
+        Ventana que reparte el min/max de toda una serie (en unidades de
+        modalidad) en 0-255, como la normalización min/max de un solo corte.
+        
+        Args:
+            series (list): Pares (ruta, dataset de cabecera) de _dicom_series
+            workers (int, optional): Hilos de lectura; None usa todos los núcleos
+        
+        Returns:
+            tuple: (center, width)
+        """
+        def modality_range(item):
+            path, ds = item
+            pixels = memmap_pixels(path)
+            pixels = stored_values(pixels, ds) if pixels is not None else pixel_array(path)
+            slope, intercept = rescale_parameters(ds)
+            return sorted((float(pixels.min()) * slope + intercept, float(pixels.max()) * slope + intercept))
+        
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            ranges = list(executor.map(modality_range, series))
+        low = min(low for low, _ in ranges)
+        high = max(high for _, high in ranges)
+        return (low + high) / 2 + 0.5, high - low + 1
+    
+    def _dicom_series(self, folder_name: str, pattern: str) -> List[Tuple[Path, pydicom.Dataset]]:
+        """
+        Lee la cabecera de los archivos de una serie y los ordena por posición.
+        
+        Args:
+            folder_name (str): Carpeta de la serie, relativa a base_path
+            pattern (str): Patrón de nombre de los archivos de la serie
+        
+        Returns:
+            list: Pares (ruta, dataset de cabecera) ordenados por posición del corte
+        """
+        series = [
+            (file, pydicom.dcmread(file, stop_before_pixels=True))
+            for file in self._folder_files(folder_name, pattern)
+        ]
+        series.sort(key=lambda item: slice_position(item[1]))
+        return series
+    
+    def _write_frames(self, jobs, ds: pydicom.Dataset, window: Optional[Tuple[float, float]],
+                      workers: Optional[int], image_format: str = "png",
+                      compression: Optional[int] = None) -> List[str]:
+        """
+        Convierte y guarda frames en un pool de hilos, con un número acotado de
+        frames en memoria a la vez. La decodificación y la compresión de Pillow
+        y zlib liberan el GIL, de modo que los hilos ocupan todos los núcleos.
+        
+        Args:
+            jobs (iterable): Tuplas (píxeles o ruta DICOM, ruta de la imagen[, dataset del corte])
+            ds (pydicom.Dataset): Dataset con la transformación por defecto
+            window (tuple, optional): (center, width) o None para usar el del archivo
+            workers (int, optional): Número de hilos; None usa todos los núcleos
+            image_format (str): Formato de las imágenes (ver dicom_image.save_image)
+            compression (int, optional): Nivel de compresión de 0 a 9
+        
+        Returns:
+            List[str]: Rutas guardadas en el orden de los trabajos
+        """
+        window = window or window_parameters(ds)
+        invert = ds.get('PhotometricInterpretation') == 'MONOCHROME1'
+        workers = workers or os.cpu_count() or 1
+        
+        def write(job):
+            source, image_path = job[0], job[1]
+            frame_ds = job[2] if len(job) > 2 else ds
+            if isinstance(source, Path):
+                pixels = pixel_array(source)
+            elif isinstance(source, np.memmap):
+                pixels = stored_values(source, frame_ds)
+            else:
+                pixels = source
+            if image_format in WINDOWED_FORMATS:
+                slope, intercept = rescale_parameters(frame_ds)
+                pixels = frame_to_uint8(pixels, slope, intercept, window, invert)
+            save_image(pixels, image_path, image_format, compression)
+            return str(image_path)
+        
+        futures = []
+        pending = set()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for job in jobs:
+                # Limitamos los frames decodificados pendientes de escribir
+                # (solo se revisan los pendientes, no todos los enviados)
+                if len(pending) >= 2 * workers:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                future = executor.submit(write, job)
+                futures.append(future)
+                pending.add(future)
+        
+        return [future.result() for future in futures]
+    
+    @staticmethod
+    def _read_dicom_dataset(file_path: Path, tags: Optional[List[Tuple[int, int]]],
+                            extract_image: bool) -> pydicom.Dataset:
+        """
+        Lee un archivo DICOM leyendo del disco solo lo necesario.
+        
+        Si no se va a extraer la imagen, la lectura se detiene antes de los
+        píxeles (stop_before_pixels), solo se decodifican los atributos básicos
+        y los tags pedidos (specific_tags) y los elementos grandes se difieren
+        (defer_size), de modo que se leen kilobytes en lugar de megabytes.
+        
+        Args:
+            file_path (Path): Ruta del archivo DICOM
+            tags (List[Tuple[int, int]], optional): Tags que se van a consultar
+            extract_image (bool): Si True, se lee la cabecera completa con los
+                píxeles diferidos (se leen después solo para el primer frame)
+        
+        Returns:
+            pydicom.Dataset: Dataset leído
+        """
+        if extract_image:
+            return pydicom.dcmread(file_path, defer_size=DICOM_DEFER_SIZE)
+        
+        requested = [Tag(tag) for tag in tags or []]
+        specific_tags = list(DICOM_HEADER_KEYWORDS) + requested
+        return pydicom.dcmread(
+            file_path,
+            # Solo leemos hasta los píxeles si se pide un tag posterior a ellos
+            stop_before_pixels=all(tag < PIXEL_DATA_TAG for tag in requested),
+            specific_tags=specific_tags,
+            defer_size=DICOM_DEFER_SIZE,
+        )
+    
+    @staticmethod
+    def _dicom_attribute(ds: pydicom.Dataset, keyword: str) -> str:
+        """
+        Obtiene un atributo del dataset como texto.
+        
+        Args:
+            ds (pydicom.Dataset): Dataset DICOM
+            keyword (str): Nombre del atributo (p. ej. 'PatientName')
+        
+        Returns:
+            str: Valor del atributo o "No disponible" si no existe o no se puede leer
+        """
+        try:
+            return str(ds.get(keyword, MISSING_ATTRIBUTE))
+        except Exception:
+            return MISSING_ATTRIBUTE
+    
+    def process_folder(self, folder_name: str, pattern: str = "*", workers: Optional[int] = None,
+                       summary: bool = False, chunksize: Optional[int] = None, cache: Optional[str] = None,
+                       tags: Optional[List[Tuple[int, int]]] = None, extract_image: bool = False,
+                       report_path: Optional[str] = None, progress: bool = True,
+                       approximate: bool = False, pixel_stats: bool = False, image_format: str = "png",
+                       compression: Optional[int] = None) -> Optional[dict]:
+        """
+        Procesa en paralelo todos los archivos CSV y DICOM de una carpeta; los
+        demás archivos se omiten (no cuentan como errores).
+        
+        Cada archivo se analiza en un proceso del pool (el parseo de pandas y
+        la decodificación de pydicom usan CPU), y los resultados y errores se
+        reúnen en un único reporte en el orden de la carpeta.
+        
+        Args:
+            folder_name (str): Nombre de la carpeta, relativa a base_path
+            pattern (str): Patrón de nombre de archivo (p. ej. "*.dcm")
+            workers (int, optional): Número de procesos; None usa todos los núcleos
+                y 1 procesa en el proceso actual
+            summary (bool): Para CSV, resume también las columnas no numéricas
+            chunksize (int, optional): Para CSV, lee por bloques de este número de filas
+            cache (str, optional): Para CSV, formato de la caché columnar ('parquet' o 'feather')
+            tags (List[Tuple[int, int]], optional): Para DICOM, tags a extraer
+            extract_image (bool): Para DICOM, extrae y guarda la imagen
+            report_path (str, optional): Carpeta donde guardar el reporte en JSON
+            progress (bool): Si True, muestra el progreso a medida que terminan
+            approximate (bool): Para CSV, estima las estadísticas (ver read_csv)
+            pixel_stats (bool): Para DICOM, añade en 'pixel_stats' las estadísticas
+                de intensidad por frame (ver dicom_pixel_stats)
+            image_format, compression: Para DICOM con extract_image, formato y
+                nivel de compresión de la imagen (ver read_dicom)
+        
+        Returns:
+            dict: Reporte con el resultado o el error de cada archivo (y, con
+            metrics, histogramas de tiempo por etapa en 'metrics'), o None si
+            la carpeta no existe
+        """
+        try:
+            folder_path = self.base_path / folder_name
+            
+            # Verificamos si la carpeta existe
+            if not folder_path.exists():
+                self._fail(f"La carpeta '{folder_path}' no existe")
+                return None
+            
+            files = self._folder_files(folder_name, pattern, ANALYZED_SUFFIXES)
+            
+            options = {
+                'summary': summary,
+                'chunksize': chunksize,
+                'cache': cache,
+                'tags': tags,
+                'extract_image': extract_image,
+                'approximate': approximate,
+                'pixel_stats': pixel_stats,
+                'image_format': image_format,
+                'compression': compression,
+            }
+            tasks = [(str(file.relative_to(self.base_path)), options) for file in files]
+            results = [None] * len(tasks)
+            
+            if workers == 1:
+                for index, task in enumerate(tasks):
+                    results[index] = self._process_file(task)
+                    if progress:
+                        self._show(f"[{index + 1}/{len(tasks)}] {results[index]['file']}")
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(self._process_file, task): index
+                               for index, task in enumerate(tasks)}
+                    for done, future in enumerate(as_completed(futures), 1):
+                        index = futures[future]
+                        results[index] = future.result()
+                        if progress:
+                            self._show(f"[{done}/{len(tasks)}] {results[index]['file']}")
+            
+            errors = [result for result in results if result['error']]
+            for result in errors:
+                self.logger.error(f"Error al procesar '{result['file']}': {result['error']}")
+            
+            report = {
+                'folder': str(folder_path),
+                'pattern': pattern,
+                'files': len(results),
+                'processed': len(results) - len(errors),
+                'errors': len(errors),
+                'results': results,
+            }
+            
+            # Histogramas por etapa del lote (y acumulados en metrics_summary)
+            if self.metrics:
+                batch_metrics = MetricsSummary()
+                for result in results:
+                    batch_metrics.add(result['metrics'])
+                    self._record_metrics(result['file'], result['metrics'])
+                report['metrics'] = batch_metrics.as_dict()
+            
+            self._show(f"\nProcesamiento de carpeta: {folder_path}")
+            self._show(f"Archivos: {report['files']}, Procesados: {report['processed']}, Errores: {report['errors']}")
+            for result in errors:
+                self._show(f" - {result['file']}: {result['error']}")
+            
+            # Guardamos el reporte si se especifica una ruta
+            if report_path:
+                report_dir = Path(report_path)
+                report_dir.mkdir(parents=True, exist_ok=True)
+                
+                report_file = report_dir / f"{folder_path.name or 'carpeta'}_batch_report.json"
+                with open(report_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._to_json(report), f, ensure_ascii=False, indent=2)
+                self._show(f"Reporte guardado en: {report_file}")
+            
+            return report
+            
+        except Exception as e:
+            self._fail(f"Error al procesar carpeta: {str(e)}")
+            return None
+    
+    def _process_file(self, task: Tuple[str, dict]) -> dict:
+        """
+        Analiza un archivo de process_folder según su extensión (o como DICOM,
+        sea cual sea, si options['dicom'] es verdadero). Se ejecuta en los
+        procesos del pool, por lo que no muestra nada ni lanza excepciones.
+        
+        Args:
+            task (tuple): (nombre del archivo relativo a base_path, opciones)
+        
+        Returns:
+            dict: Archivo, tipo, resultado del análisis, error (None si no hubo) y
+            métricas por etapa (vacías si no se miden)
+        """
+        filename, options = task
+        suffix = Path(filename).suffix.lower()
+        result = {'file': filename, 'type': None, 'result': None, 'error': None, 'metrics': {}}
+        stages = self._stage_timer()
+        
+        try:
+            if suffix == '.csv':
+                result['type'] = 'csv'
+                file_path = self.base_path / filename
+                result['result'] = self._csv_analysis(file_path, options['summary'], options['chunksize'],
+                                                      options.get('cache'), options.get('approximate', False),
+                                                      stages)
+            elif suffix in DICOM_SUFFIXES or options.get('dicom'):
+                result['type'] = 'dicom'
+                analysis = self._dicom_analysis(filename, options['tags'], options['extract_image'], stages,
+                                                options.get('image_format', 'png'), options.get('compression'))
+                result['result'] = analysis
+                if options.get('pixel_stats'):
+                    analysis['pixel_stats'] = self._pixel_stats(self.base_path / filename, stages=stages)
+                if analysis['image_error']:
+                    result['error'] = f"Error al extraer imagen: {analysis['image_error']}"
+            else:
+                result['error'] = "Tipo de archivo no soportado"
+        except Exception as e:
+            result['error'] = str(e)
+        
+        result['metrics'] = stages.as_dict()
+        stages.close()
+        return result
+    
+    @classmethod
+    def _to_json(cls, value):
+        """
+        Convierte un resultado en tipos que admite JSON: claves de tags DICOM
+        como texto, escalares de numpy como números y el resto como texto.
+        """
+        if isinstance(value, dict):
+            return {
+                (f"({key[0]:#06x}, {key[1]:#06x})" if isinstance(key, tuple) else str(key)): cls._to_json(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [cls._to_json(item) for item in value]
+        if isinstance(value, np.generic):
+            return value.item()
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        if isinstance(value, bytes):
+            return value.hex()
+        return str(value)
 
 # Ejemplo de uso de la clase
 if __name__ == "__main__":
@@ -296,4 +1508,8 @@ if __name__ == "__main__":
         extract_image=True
     )
     
+    # Ejemplo 4: Procesamos en paralelo todos los archivos DICOM de la carpeta
+    print("\n4. Procesando carpeta en paralelo:")
+    processor.process_folder(".", pattern="*.dcm", workers=2)
+    
     print("\n=== FIN DEL EJEMPLO ===") 
\ No newline at end of file
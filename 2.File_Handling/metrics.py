@@ -0,0 +1,220 @@
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import nullcontext
+
+# Límites superiores (segundos) de los intervalos de los histogramas: serie 1-2-5
+HISTOGRAM_EDGES = tuple(base * 10.0 ** exponent for exponent in range(-5, 3) for base in (1, 2, 5))
+
+# Medidores abiertos que usan tracemalloc y si lo activaron ellos
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+
+def _acquire_tracing() -> None:
+    """Activa tracemalloc si no lo estaba y registra un medidor que lo usa."""
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    """Da de baja un medidor y detiene tracemalloc si lo activaron los medidores y ya no lo usa ninguno."""
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+class StageTimer:
+    """
+    Mide el tiempo y, opcionalmente, la memoria pico de cada etapa de un
+    análisis. Si una etapa se repite (p. ej. una por bloque de un CSV) sus
+    tiempos se suman y se conserva el mayor pico. Las etapas no se anidan.
+
+    El pico de memoria de tracemalloc es global al proceso: con etapas
+    ejecutándose a la vez en varios hilos, cada una reinicia el pico de las
+    demás y se atribuye su memoria, por lo que los picos solo son fiables si
+    las etapas de un proceso se ejecutan de una en una (como en process_folder).
+    """
+
+    __slots__ = ('memory', 'seconds', 'peak_bytes', '_tracing')
+
+    def __init__(self, memory: bool = False):
+        """
+        Inicializa el medidor.
+
+        Args:
+            memory (bool): Si True, mide también la memoria pico de cada etapa
+                con tracemalloc (que se activa si no lo estaba y se detiene al
+                cerrar el último medidor, salvo que ya estuviera activo)
+        """
+        self.memory = memory
+        self.seconds = {}
+        self.peak_bytes = {}
+        self._tracing = memory
+        if memory:
+            _acquire_tracing()
+
+    def __call__(self, name: str) -> "_Stage":
+        """
+        Context manager que mide una etapa.
+
+        Args:
+            name (str): Nombre de la etapa (p. ej. 'parse', 'decode')
+        """
+        return _Stage(self, name)
+
+    def as_dict(self) -> dict:
+        """
+        Métricas medidas.
+
+        Returns:
+            dict: {'seconds': {etapa: segundos}, 'peak_bytes': {etapa: bytes}}
+            (peak_bytes solo si se mide la memoria)
+        """
+        metrics = {'seconds': dict(self.seconds)}
+        if self.memory:
+            metrics['peak_bytes'] = dict(self.peak_bytes)
+        return metrics
+
+    def close(self) -> None:
+        """Deja de usar tracemalloc (lo detiene si lo activó un medidor y es el último)."""
+        if self._tracing:
+            self._tracing = False
+            _release_tracing()
+
+
+class _Stage:
+    """Medición de una etapa de StageTimer."""
+
+    __slots__ = ('timer', 'name', 'start', 'base')
+
+    def __init__(self, timer: StageTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        if self.timer.memory:
+            tracemalloc.reset_peak()
+            self.base = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        timer = self.timer
+        timer.seconds[self.name] = timer.seconds.get(self.name, 0.0) + elapsed
+        if timer.memory:
+            peak = tracemalloc.get_traced_memory()[1] - self.base
+            timer.peak_bytes[self.name] = max(timer.peak_bytes.get(self.name, 0), peak)
+        return False
+
+
+class _NullTimer:
+    """Medidor desactivado: cada etapa es un context manager vacío compartido."""
+
+    __slots__ = ()
+    _stage = nullcontext()
+
+    def __call__(self, name: str):
+        return self._stage
+
+    def as_dict(self) -> dict:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+# Medidor que se usa cuando la instrumentación está desactivada
+NULL_TIMER = _NullTimer()
+
+
+class MetricsSummary:
+    """
+    Agrega las métricas de muchos análisis: por etapa, número de muestras,
+    total, mínimo, máximo, pico de memoria máximo e histograma de tiempos
+    en intervalos HISTOGRAM_EDGES.
+    """
+
+    def __init__(self):
+        """Inicializa un resumen vacío."""
+        self.stages = {}
+
+    def add(self, metrics: dict) -> None:
+        """
+        Añade las métricas de un análisis (StageTimer.as_dict).
+
+        Args:
+            metrics (dict): Métricas a añadir
+        """
+        peaks = metrics.get('peak_bytes', {})
+        for name, seconds in metrics.get('seconds', {}).items():
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = {
+                    'count': 0, 'total': 0.0, 'min': seconds, 'max': seconds,
+                    'peak_bytes': None, 'buckets': [0] * (len(HISTOGRAM_EDGES) + 1),
+                }
+            stage['count'] += 1
+            stage['total'] += seconds
+            stage['min'] = min(stage['min'], seconds)
+            stage['max'] = max(stage['max'], seconds)
+            stage['buckets'][bisect_left(HISTOGRAM_EDGES, seconds)] += 1
+            if name in peaks:
+                stage['peak_bytes'] = max(stage['peak_bytes'] or 0, peaks[name])
+
+    def merge(self, other: "MetricsSummary") -> None:
+        """
+        Combina otro resumen con este.
+
+        Args:
+            other (MetricsSummary): Resumen a combinar
+        """
+        for name, theirs in other.stages.items():
+            mine = self.stages.get(name)
+            if mine is None:
+                self.stages[name] = {**theirs, 'buckets': list(theirs['buckets'])}
+                continue
+            mine['count'] += theirs['count']
+            mine['total'] += theirs['total']
+            mine['min'] = min(mine['min'], theirs['min'])
+            mine['max'] = max(mine['max'], theirs['max'])
+            if theirs['peak_bytes'] is not None:
+                mine['peak_bytes'] = max(mine['peak_bytes'] or 0, theirs['peak_bytes'])
+            mine['buckets'] = [a + b for a, b in zip(mine['buckets'], theirs['buckets'])]
+
+    def as_dict(self) -> dict:
+        """
+        Resumen por etapa.
+
+        Returns:
+            dict: Etapa -> count, total, mean, min, max, peak_bytes e histograma
+            {'<=límite': muestras} (solo intervalos con muestras)
+        """
+        summary = {}
+        for name, stage in self.stages.items():
+            histogram = {}
+            for index, count in enumerate(stage['buckets']):
+                if count:
+                    label = f"<={HISTOGRAM_EDGES[index]:g}s" if index < len(HISTOGRAM_EDGES) \
+                        else f">{HISTOGRAM_EDGES[-1]:g}s"
+                    histogram[label] = count
+            summary[name] = {
+                'count': stage['count'],
+                'total': stage['total'],
+                'mean': stage['total'] / stage['count'],
+                'min': stage['min'],
+                'max': stage['max'],
+                'peak_bytes': stage['peak_bytes'],
+                'histogram': histogram,
+            }
+        return summary
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    image_suffix TEXT,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access);
+"""
+
+# Se incluye en las claves: cambiarlo invalida las entradas de versiones anteriores
+CACHE_VERSION = 1
+
+# Modos de clave: identidad del archivo en disco o hash de su contenido
+KEY_MODES = ('stat', 'content')
+
+
+class ResultCache:
+    """
+    Caché en disco de los análisis de FileProcessor (read_csv, read_dicom y
+    process_folder), con tamaño máximo y desalojo LRU.
+
+    La clave de cada entrada combina el archivo y los parámetros del análisis.
+    Con key="stat" el archivo se identifica por dispositivo, inodo, tamaño y
+    fecha de modificación (sin leerlo); con key="content", por el hash BLAKE2b
+    de su contenido, de modo que archivos idénticos en rutas distintas
+    comparten la entrada. Las imágenes extraídas se guardan junto al análisis.
+
+    La caché puede compartirse entre procesos: el índice es una base SQLite
+    cuyas transacciones (BEGIN IMMEDIATE) serializan altas y desalojos entre
+    procesos, y los datos se escriben con un nombre temporal y se renombran,
+    de modo que nunca se lee una entrada a medio escribir. Los análisis se
+    guardan con pickle: la carpeta de la caché debe ser de confianza.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = ".file_processor_cache", max_bytes: int = 1 << 30,
+                 key: str = "stat"):
+        """
+        Inicializa la caché y crea su carpeta si no existe.
+
+        Args:
+            cache_dir (str | Path): Carpeta de la caché
+            max_bytes (int): Tamaño máximo de los datos guardados; al superarlo
+                se eliminan las entradas usadas hace más tiempo
+            key (str): 'stat' (inodo, tamaño y fecha de modificación) o
+                'content' (hash del contenido)
+        """
+        if key not in KEY_MODES:
+            raise ValueError(f"Modo de clave desconocido: {key} (opciones: {', '.join(KEY_MODES)})")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.key_mode = key
+        self.hits = 0
+        self.misses = 0
+
+        (self.cache_dir / "objects").mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexión al índice propia de cada hilo y de cada proceso."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.cache_dir / "index.sqlite", timeout=60, isolation_level=None)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _object_path(self, key: str, suffix: str = ".pkl") -> Path:
+        return self.cache_dir / "objects" / key[:2] / f"{key}{suffix}"
+
+    def key(self, file_path: Path, kind: str, params: dict) -> str:
+        """
+        Clave de un análisis.
+
+        Args:
+            file_path (Path): Archivo analizado
+            kind (str): Tipo de análisis (p. ej. 'csv', 'dicom')
+            params (dict): Parámetros que afectan al resultado (serializables a JSON)
+
+        Returns:
+            str: Clave hexadecimal
+        """
+        if self.key_mode == "content":
+            with open(file_path, 'rb') as f:
+                identity = hashlib.file_digest(f, 'blake2b').hexdigest()
+        else:
+            stat = file_path.stat()
+            identity = f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+        description = json.dumps([CACHE_VERSION, self.key_mode, identity, kind, params], sort_keys=True, default=str)
+        return hashlib.blake2b(description.encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[dict, Optional[Path]]]:
+        """
+        Busca un análisis y marca la entrada como usada.
+
+        Args:
+            key (str): Clave (ver key)
+
+        Returns:
+            tuple | None: (análisis, ruta de la imagen guardada o None), o None
+            si no está en la caché
+        """
+        connection = self._connection()
+        row = connection.execute("SELECT image_suffix FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        try:
+            with open(self._object_path(key), 'rb') as f:
+                analysis = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # Desalojada por otro proceso entre la consulta y la lectura, o dañada
+            self.misses += 1
+            return None
+
+        image = self._object_path(key, row[0]) if row[0] else None
+        if image is not None and not image.exists():
+            self.misses += 1
+            return None
+
+        connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return analysis, image
+
+    def put(self, key: str, analysis: dict, image_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Guarda un análisis (y la imagen extraída, si la hay) y desaloja las
+        entradas menos usadas si se supera max_bytes.
+
+        Args:
+            key (str): Clave (ver key)
+            analysis (dict): Resultado del análisis
+            image_path (str | Path, optional): Imagen generada por el análisis
+        """
+        data_path = self._object_path(key)
+        data_path.parent.mkdir(exist_ok=True)
+        suffix = Path(image_path).suffix if image_path else None
+        written = [self._write_atomic(data_path, pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL))]
+        if image_path:
+            written.append(self._copy_atomic(Path(image_path), self._object_path(key, suffix)))
+
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, size, image_suffix, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sum(written), suffix, now, now),
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Elimina las entradas usadas hace más tiempo hasta quedar por debajo de max_bytes."""
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size, suffix in connection.execute(
+                "SELECT key, size, image_suffix FROM results ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key, suffix))
+            total -= size
+
+        connection.executemany("DELETE FROM results WHERE key = ?", [(key,) for key, _ in evicted])
+        for key, suffix in evicted:
+            self._object_path(key).unlink(missing_ok=True)
+            if suffix:
+                self._object_path(key, suffix).unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> int:
+        """Escribe un archivo con un nombre temporal y lo renombra; devuelve su tamaño."""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    @staticmethod
+    def _copy_atomic(source: Path, path: Path) -> int:
+        """Copia un archivo con un nombre temporal y lo renombra; devuelve su tamaño."""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, path)
+        return path.stat().st_size
+
+    def stats(self) -> dict:
+        """
+        Estado de la caché.
+
+        Returns:
+            dict: Entradas, bytes guardados y aciertos y fallos de esta instancia
+        """
+        entries, size = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {'entries': entries, 'bytes': size, 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self) -> None:
+        """Elimina todas las entradas."""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM results")
+            shutil.rmtree(self.cache_dir / "objects", ignore_errors=True)
+            (self.cache_dir / "objects").mkdir()
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """Cierra la conexión del hilo actual con el índice."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def __getstate__(self):
+        # Las conexiones no se copian a otros procesos: cada uno abre la suya
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,220 @@
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Result:
+    """
+    Base de los resultados de FileProcessor. Un resultado es verdadero si la
+    operación terminó sin error, como antes lo era un resultado distinto de None.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self) -> bool:
+        """bool: True si la operación terminó sin error."""
+        return self.error is None
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def to_dict(self) -> dict:
+        """
+        Convierte el resultado en un diccionario (p. ej. para serializarlo).
+
+        Returns:
+            dict: Campos del resultado
+        """
+        return {item.name: getattr(self, item.name) for item in fields(self)}
+
+
+@dataclass(slots=True)
+class CsvResult(Result):
+    """Resultado de FileProcessor.read_csv."""
+    file: str
+    columns: List[str] = field(default_factory=list)
+    rows: int = 0
+    # Columna -> {'average', 'std_dev'} (en modo aproximado, también
+    # 'average_margin', 'std_dev_margin' y 'sample_size')
+    numeric: Dict[str, dict] = field(default_factory=dict)
+    # Columna -> {'unique', 'unique_exceeded', 'top', 'approximate', 'error_bound'}
+    # (en modo aproximado, también 'unique_error')
+    non_numeric: Dict[str, dict] = field(default_factory=dict)
+    report_file: Optional[str] = None
+    # Métricas por etapa (ver metrics.StageTimer), vacías si no se miden
+    metrics: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class DicomResult(Result):
+    """Resultado de FileProcessor.read_dicom."""
+    file: str
+    patient_name: str = ""
+    study_date: str = ""
+    modality: str = ""
+    # Tags leídos, errores por tag y tags pedidos (los que faltan no están en tags)
+    tags: Dict[Tuple[int, int], Any] = field(default_factory=dict)
+    tag_errors: Dict[Tuple[int, int], str] = field(default_factory=dict)
+    requested_tags: List[Tuple[int, int]] = field(default_factory=list)
+    extract_image: bool = False
+    image_path: Optional[str] = None
+    image_error: Optional[str] = None
+    metrics: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PixelStatsResult(Result):
+    """Resultado de FileProcessor.dicom_pixel_stats."""
+    file: str
+    # Transformación de modalidad aplicada (1 y 0 con rescale=False)
+    slope: float = 1.0
+    intercept: float = 0.0
+    # Estadísticas de cada frame (ver dicom_image.pixel_statistics), con su índice en 'frame'
+    frames: List[dict] = field(default_factory=list)
+    metrics: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class FolderListing(Result):
+    """Resultado de FileProcessor.list_folder_contents."""
+    folder: str
+    # Elementos FolderEntry de FileProcessor.iter_folder
+    files: list = field(default_factory=list)
+    folders: list = field(default_factory=list)
+    details: bool = False
+    error: Optional[str] = None
+
+
+class ConsoleRenderer:
+    """
+    Muestra en consola los resultados y mensajes de FileProcessor. Es el
+    renderizador por defecto; con renderer=None el procesador no escribe nada
+    en la salida estándar.
+    """
+
+    def render(self, result: Result) -> None:
+        """
+        Muestra un resultado de read_csv, read_dicom, dicom_pixel_stats o
+        list_folder_contents.
+
+        Args:
+            result (Result): Resultado a mostrar
+        """
+        if result.error is not None:
+            self.error(result.error)
+        elif isinstance(result, CsvResult):
+            self.render_csv(result)
+        elif isinstance(result, DicomResult):
+            self.render_dicom(result)
+        elif isinstance(result, PixelStatsResult):
+            self.render_pixel_stats(result)
+        elif isinstance(result, FolderListing):
+            self.render_listing(result)
+
+    def message(self, text: str) -> None:
+        """Muestra un mensaje informativo."""
+        print(text)
+
+    def error(self, text: str) -> None:
+        """Muestra un mensaje de error."""
+        print(f"ERROR: {text}")
+
+    def render_csv(self, result: CsvResult) -> None:
+        """Muestra el análisis de un CSV."""
+        print(f"\nAnálisis CSV: {result.file}")
+        print(f"Columnas: {result.columns}")
+        print(f"Filas: {result.rows}")
+
+        # Mostramos las columnas numéricas
+        if result.numeric:
+            print("Columnas Numéricas:")
+            for col, data in result.numeric.items():
+                if 'average_margin' in data:
+                    print(f" - {col}: Promedio = {data['average']:.2f} ± {data['average_margin']:.2f}, "
+                          f"Desviación Estándar = {data['std_dev']:.2f} ± {data['std_dev_margin']:.2f} "
+                          f"(aprox., 95 %, muestra de {data['sample_size']})")
+                else:
+                    print(f" - {col}: Promedio = {data['average']:.2f}, Desviación Estándar = {data['std_dev']:.2f}")
+
+        # Mostramos resumen de columnas no numéricas si se calculó
+        if result.non_numeric:
+            print("Resumen de Columnas No Numéricas:")
+            for col, data in result.non_numeric.items():
+                unique_prefix = ">" if data['unique_exceeded'] else ""
+                if 'unique_error' in data:
+                    print(f" - {col}: Valores únicos ≈ {data['unique']} (± {data['unique_error']:.1%})")
+                else:
+                    print(f" - {col}: Valores únicos = {unique_prefix}{data['unique']}")
+                if data['approximate']:
+                    print(f"   Frecuencias (aprox., error máximo {data['error_bound']}): {data['top']}")
+                else:
+                    print(f"   Frecuencias: {data['top']}")  # Mostramos los 5 más frecuentes
+
+        if result.report_file:
+            print(f"Reporte guardado en: {result.report_file}")
+
+    def render_dicom(self, result: DicomResult) -> None:
+        """Muestra el análisis de un archivo DICOM."""
+        print(f"\nAnálisis DICOM: {result.file}")
+
+        # Mostramos información básica del paciente
+        print(f"Nombre del Paciente: {result.patient_name}")
+        print(f"Fecha del Estudio: {result.study_date}")
+        print(f"Modalidad: {result.modality}")
+
+        # Mostramos tags específicos si se pidieron
+        if result.requested_tags:
+            print("Tags específicos:")
+            for tag in result.requested_tags:
+                if tag in result.tag_errors:
+                    print(f"Tag {hex(tag[0])}, {hex(tag[1])}: Error al leer - {result.tag_errors[tag]}")
+                elif tag in result.tags:
+                    print(f"Tag {hex(tag[0])}, {hex(tag[1])}: {result.tags[tag]}")
+                else:
+                    print(f"Tag {hex(tag[0])}, {hex(tag[1])}: No encontrado")
+
+        # Mostramos el resultado de la extracción de imagen
+        if result.extract_image:
+            if result.image_error:
+                self.error(f"Error al extraer imagen: {result.image_error}")
+            elif result.image_path:
+                print(f"Imagen extraída y guardada en: {result.image_path}")
+            else:
+                print("El archivo DICOM no contiene datos de imagen")
+
+    def render_pixel_stats(self, result: PixelStatsResult) -> None:
+        """Muestra las estadísticas de píxeles de un archivo DICOM."""
+        print(f"\nEstadísticas de píxeles de {result.file}: {len(result.frames)} frames")
+        for frame in result.frames:
+            print(f" - Frame {frame['frame']}: min = {frame['min']:g}, max = {frame['max']:g}, "
+                  f"media = {frame['mean']:.2f}, desviación = {frame['std']:.2f}")
+
+    def render_listing(self, result: FolderListing) -> None:
+        """Muestra el contenido de una carpeta."""
+        print(f"\nCarpeta: {result.folder}")
+        print(f"Número de elementos: {len(result.files) + len(result.folders)}")
+
+        # Mostramos archivos
+        if result.files:
+            print("Archivos:")
+            for file in result.files:
+                if result.details:
+                    # Tamaño en MB y fecha de modificación
+                    size_mb = file.size / (1024 * 1024)
+                    mod_time = datetime.fromtimestamp(file.mtime)
+                    print(f" - {file.name} ({size_mb:.2f} MB, Modificado: {mod_time.strftime('%Y-%m-%d %H:%M:%S')})")
+                else:
+                    print(f" - {file.name}")
+
+        # Mostramos carpetas
+        if result.folders:
+            print("Carpetas:")
+            for folder in result.folders:
+                if result.details:
+                    mod_time = datetime.fromtimestamp(folder.mtime)
+                    print(f" - {folder.name} (Modificado: {mod_time.strftime('%Y-%m-%d %H:%M:%S')})")
+                else:
+                    print(f" - {folder.name}")